@@ -0,0 +1,175 @@
+"""Export the skin-disease model for lightweight CPU serving and check it against Keras.
+
+    # float16 and int8 TFLite (int8 calibrated on ~100 training images), plus ONNX
+    python export_model.py export --calibration-dir dataset --onnx
+
+    # top-1 agreement, probability drift, accuracy, latency and RSS per backend
+    python export_model.py compare --eval-dir heldout
+
+Image folders use the training layout (one sub-folder per class), so the
+comparison also reports accuracy when folder names match class_names.
+Serve an exported model with MODEL_BACKEND=tflite-fp16 (or tflite-int8,
+onnx) python main.py.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import subprocess
+
+import numpy as np
+
+from inference import MODEL_FILES, IMAGE_SIZE, class_names, load_backend, load_image_array
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp")
+
+
+def list_images(folder, limit=None, seed=0):
+    """(path, class name or None) for images under folder, a seeded sample of `limit` if given."""
+    items = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        label = os.path.basename(root) if os.path.basename(root) in class_names else None
+        items.extend((os.path.join(root, f), label) for f in sorted(files) if f.lower().endswith(IMAGE_EXTENSIONS))
+    if limit and len(items) > limit:
+        items = random.Random(seed).sample(items, limit)
+    return items
+
+
+# ---------- Export ----------
+def export(keras_path, calibration_dir, calibration_count, onnx):
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(keras_path)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    write(MODEL_FILES["tflite-fp16"], converter.convert())
+
+    calibration = [path for path, _ in list_images(calibration_dir, calibration_count)]
+    if not calibration:
+        sys.exit(f"No calibration images found under {calibration_dir}")
+
+    def representative_dataset():
+        for path in calibration:
+            yield [load_image_array(path)[0][np.newaxis].copy()]
+
+    # Full-integer weights and activations; input and output stay float32 so
+    # serving feeds the same tensors as the Keras model
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    write(MODEL_FILES["tflite-int8"], converter.convert())
+
+    if onnx:
+        try:
+            import tf2onnx
+        except ImportError:
+            sys.exit("ONNX export needs tf2onnx: pip install tf2onnx onnxruntime")
+        spec = (tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32, name="input"),)
+        tf2onnx.convert.from_keras(model, input_signature=spec, opset=17, output_path=MODEL_FILES["onnx"])
+        print(f"wrote {MODEL_FILES['onnx']} ({os.path.getsize(MODEL_FILES['onnx']) / 2**20:.1f} MiB)")
+
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    print(f"wrote {path} ({len(data) / 2**20:.1f} MiB)")
+
+
+# ---------- Compare ----------
+def measure(backend, path, images, threads):
+    """Run in a fresh process per backend so peak RSS and import cost are its own."""
+    started = time.perf_counter()
+    model = load_backend(backend, path, threads)
+    load_seconds = time.perf_counter() - started
+
+    probs, latencies = [], []
+    for image_path, _ in images:
+        x = load_image_array(image_path)[0][np.newaxis]
+        started = time.perf_counter()
+        probs.append(np.asarray(model.predict_on_batch(x))[0].tolist())
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {
+        "load_seconds": load_seconds,
+        # The first call includes graph tracing / tensor allocation
+        "latency_ms": sorted(latencies[1:] or latencies),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "probs": probs,
+    }
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q / 100 * len(values)))] if values else 0.0
+
+
+def compare(eval_dir, limit, backends, threads):
+    images = list_images(eval_dir, limit)
+    if not images:
+        sys.exit(f"No images found under {eval_dir}")
+    labels = [label for _, label in images]
+
+    results = {}
+    for backend in ["keras"] + [b for b in backends if b != "keras"]:
+        if not os.path.exists(MODEL_FILES[backend]):
+            print(f"skipping {backend}: {MODEL_FILES[backend]} not found (run export first)")
+            continue
+        cmd = [sys.executable, __file__, "_measure", backend, "--threads", str(threads or 0)]
+        out = subprocess.run(cmd, input=json.dumps(images), capture_output=True, text=True, check=True)
+        results[backend] = json.loads(out.stdout.strip().splitlines()[-1])
+
+    reference = np.array(results["keras"]["probs"])
+    print(f"{len(images)} images, {sum(l is not None for l in labels)} labelled\n")
+    print(f"{'backend':<12} {'size MiB':>8} {'top1 agree':>10} {'max |dp|':>9} {'accuracy':>9} "
+          f"{'p50 ms':>8} {'p90 ms':>8} {'load s':>7} {'RSS MiB':>8}")
+    for backend, r in results.items():
+        probs = np.array(r["probs"])
+        predicted = probs.argmax(axis=1)
+        labelled = [(p, class_names.index(l)) for p, l in zip(predicted, labels) if l is not None]
+        accuracy = f"{np.mean([p == l for p, l in labelled]):.4f}" if labelled else "-"
+        print(f"{backend:<12} {os.path.getsize(MODEL_FILES[backend]) / 2**20:>8.1f} "
+              f"{np.mean(predicted == reference.argmax(axis=1)):>10.4f} "
+              f"{np.abs(probs - reference).max():>9.4f} {accuracy:>9} "
+              f"{percentile(r['latency_ms'], 50):>8.2f} {percentile(r['latency_ms'], 90):>8.2f} "
+              f"{r['load_seconds']:>7.2f} {r['peak_rss_mb']:>8.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("export", help="write float16/int8 TFLite (and optionally ONNX) models into static/")
+    p.add_argument("--keras", default=MODEL_FILES["keras"])
+    p.add_argument("--calibration-dir", required=True, help="images for int8 calibration, e.g. the training set")
+    p.add_argument("--calibration-count", type=int, default=100)
+    p.add_argument("--onnx", action="store_true", help="also write an ONNX model (needs tf2onnx)")
+
+    p = sub.add_parser("compare", help="parity, latency and memory of each backend against Keras")
+    p.add_argument("--eval-dir", required=True, help="held-out images, ideally in class sub-folders")
+    p.add_argument("--limit", type=int, default=200)
+    p.add_argument("--backends", nargs="+", default=[b for b in MODEL_FILES if b != "keras"], choices=list(MODEL_FILES))
+    p.add_argument("--threads", type=int, default=None)
+
+    p = sub.add_parser("_measure")
+    p.add_argument("backend", choices=list(MODEL_FILES))
+    p.add_argument("--threads", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args.keras, args.calibration_dir, args.calibration_count, args.onnx)
+    elif args.command == "compare":
+        compare(args.eval_dir, args.limit, args.backends, args.threads)
+    else:
+        result = measure(args.backend, None, json.load(sys.stdin), args.threads or None)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
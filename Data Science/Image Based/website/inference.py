@@ -0,0 +1,396 @@
+import io
+import os
+import sys
+import time
+import hashlib
+import queue
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, InvalidStateError
+
+import numpy as np
+from PIL import Image, UnidentifiedImageError
+
+
+class_names = ['Acne And Rosacea Photos', 'Actinic Keratosis Basal Cell Carcinoma And Other Malignant Lesions', 'Atopic Dermatitis Photos', 'Ba  Cellulitis', 'Ba Impetigo', 'Benign', 'Bullous Disease Photos', 'Cellulitis Impetigo And Other Bacterial Infections', 'Eczema Photos', 'Exanthems And Drug Eruptions', 'Fu Athlete Foot', 'Fu Nail Fungus', 'Fu Ringworm', 'Hair Loss Photos Alopecia And Other Hair Diseases', 'Herpes Hpv And Other Stds Photos', 'Light Diseases And Disorders Of Pigmentation', 'Lupus And Other Connective Tissue Diseases', 'Malignant', 'Melanoma Skin Cancer Nevi And Moles', 'Rashes']
+
+IMAGE_SIZE = (224, 224)
+
+# Default model file per backend; export_model.py writes the non-Keras ones
+MODEL_FILES = {
+    "keras": "static/skin_disease_model_tf.keras",
+    "tflite-fp16": "static/skin_disease_model_fp16.tflite",
+    "tflite-int8": "static/skin_disease_model_int8.tflite",
+    "onnx": "static/skin_disease_model.onnx",
+}
+
+
+def open_image(data):
+    """Sniff and open an uploaded image from its bytes; None if PIL cannot identify it.
+
+    Only the header is parsed here; pixels are decoded once, by image_to_array.
+    """
+    try:
+        return Image.open(io.BytesIO(data))
+    except (UnidentifiedImageError, OSError):
+        return None
+
+
+_buffers = threading.local()
+
+
+def _input_buffer(target_size):
+    buffer = getattr(_buffers, "array", None)
+    if buffer is None or buffer.shape[:2] != tuple(target_size):
+        buffer = _buffers.array = np.empty((*target_size, 3), dtype=np.float32)
+    return buffer
+
+
+def image_to_array(img, target_size=IMAGE_SIZE):
+    """Decode img into the model's float32 input.
+
+    JPEGs are decoded straight at a reduced scale (1/2, 1/4 or 1/8, the
+    smallest still at least target_size), so a 12 MP photo never exists
+    at full size; one bilinear resize then lands on target_size. The result
+    stays within a mean of 1 and a max of 16 (uint8 levels) of a full-size
+    decode + bilinear resize (test_inference.PreprocessingParityTests).
+    Nearest, keras load_img's default, can't be matched from a reduced
+    decode: it keeps whichever full-size pixel it lands on, so on a noisy
+    photo it differs from any downscale by ~15 on average. Bilinear is also
+    how image_dataset_from_directory resized the training images.
+    EfficientNet rescales inside the model (its preprocess_input is a
+    pass-through), so no further preprocessing is needed.
+
+    The array is a per-thread buffer, overwritten by this thread's next
+    call; copy it to keep it longer.
+    """
+    width, height = target_size[1], target_size[0]
+    img.draft("RGB", (width, height))
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    if img.size != (width, height):
+        img = img.resize((width, height), Image.BILINEAR)
+    x = _input_buffer(target_size)
+    x[...] = np.asarray(img)
+    return x, img
+
+
+def load_image_array(img_path, target_size=IMAGE_SIZE):
+    with open(img_path, "rb") as f:
+        return image_to_array(Image.open(io.BytesIO(f.read())), target_size)
+
+
+# ---------- Backends ----------
+class KerasBackend:
+    def __init__(self, path):
+        from tensorflow.keras.models import load_model
+
+        self.model = load_model(path)
+
+    def predict_on_batch(self, batch):
+        return np.asarray(self.model.predict_on_batch(batch))
+
+
+class TFLiteBackend:
+    """A TFLite interpreter, from tflite_runtime when installed so TensorFlow never loads."""
+
+    def __init__(self, path, num_threads=None):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+
+        self.interpreter = Interpreter(model_path=path, num_threads=num_threads)
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._batch_shape = None
+
+    def predict_on_batch(self, batch):
+        if batch.shape != self._batch_shape:
+            self.interpreter.resize_tensor_input(self.input["index"], batch.shape)
+            self.interpreter.allocate_tensors()
+            self._batch_shape = batch.shape
+        scale, zero_point = self.input["quantization"]
+        if scale:
+            batch = np.round(batch / scale + zero_point)
+        self.interpreter.set_tensor(self.input["index"], batch.astype(self.input["dtype"]))
+        self.interpreter.invoke()
+        out = self.interpreter.get_tensor(self.output["index"])
+        scale, zero_point = self.output["quantization"]
+        if scale:
+            out = (out.astype(np.float32) - zero_point) * scale
+        return out
+
+
+class OnnxBackend:
+    def __init__(self, path, num_threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict_on_batch(self, batch):
+        return self.session.run(None, {self.input_name: batch.astype(np.float32)})[0]
+
+
+def load_backend(name="keras", path=None, num_threads=None):
+    """A model wrapper with predict_on_batch(float32 NHWC batch) -> class probabilities."""
+    if name not in MODEL_FILES:
+        raise ValueError(f"Unknown model backend {name!r}; choose one of {', '.join(MODEL_FILES)}")
+    path = path or MODEL_FILES[name]
+    if name == "keras":
+        return KerasBackend(path)
+    if name == "onnx":
+        return OnnxBackend(path, num_threads)
+    return TFLiteBackend(path, num_threads)
+
+
+def model_fingerprint(path):
+    """(size, mtime) of a model file, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class ReloadingBackend:
+    """load_backend's model, reloaded when its file's size or mtime changes.
+
+    The file is checked before each batch; MicroBatcher makes that its only
+    caller, so a reload never races a prediction. `fingerprint` belongs to
+    the file the loaded model came from (stat'ed before loading, so a write
+    during the load is picked up by the next check). A file that fails to
+    load, e.g. one still being copied, keeps the old model serving and is
+    retried on the next batch.
+    """
+
+    def __init__(self, name="keras", path=None, num_threads=None):
+        self.name = name
+        self.path = path or MODEL_FILES.get(name)
+        self.num_threads = num_threads
+        self.fingerprint = model_fingerprint(self.path)
+        self.backend = load_backend(name, self.path, num_threads)
+        self._reloads = 0
+        self._reload_errors = 0
+
+    def _check_file(self):
+        fingerprint = model_fingerprint(self.path)
+        if fingerprint is None or fingerprint == self.fingerprint:
+            return
+        try:
+            backend = load_backend(self.name, self.path, self.num_threads)
+        except Exception:
+            self._reload_errors += 1
+            return
+        self.backend = backend
+        self.fingerprint = fingerprint
+        self._reloads += 1
+
+    def predict_on_batch(self, batch):
+        self._check_file()
+        return self.backend.predict_on_batch(batch)
+
+    def stats(self):
+        return {
+            "backend": self.name,
+            "path": self.path,
+            "reloads": self._reloads,
+            "reload_errors": self._reload_errors,
+        }
+
+
+# ---------- Micro-batching ----------
+
+
+class MicroBatcher:
+    """Runs concurrent single-image predictions as one batched model call.
+
+    Requests queue up preprocessed tensors; a worker thread takes the first
+    waiting item, keeps collecting until it has `max_batch` items or
+    `max_wait_ms` has passed, calls `predict_fn` on the stacked batch and
+    hands each row back to the request that submitted it.
+    """
+
+    def __init__(self, predict_fn, max_batch=16, max_wait_ms=10):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+        self._batch_sizes = Counter()
+        self._max_queue_depth = 0
+        self._busy_seconds = 0.0
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, x):
+        """Queue one preprocessed image (no batch dimension); returns a Future of its prediction row.
+
+        x is copied into the batch before the Future resolves, so a caller
+        waiting on the result may reuse its buffer afterwards.
+        """
+        future = Future()
+        self._queue.put((x, future))
+        with self._lock:
+            self._requests += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return future
+
+    def predict(self, x, timeout=None):
+        return self.submit(x).result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # Futures cancelled while queued are dropped; the rest can no longer be cancelled
+            batch = [(x, future) for x, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                preds = self.predict_fn(np.stack([x for x, _ in batch]))
+            except Exception as exc:
+                with self._lock:
+                    self._errors += 1
+                for _, future in batch:
+                    self._deliver(future.set_exception, exc)
+                continue
+            for row, (_, future) in zip(preds, batch):
+                self._deliver(future.set_result, row)
+            with self._lock:
+                self._batches += 1
+                self._batch_sizes[len(batch)] += 1
+                self._busy_seconds += time.monotonic() - started
+
+    @staticmethod
+    def _deliver(setter, value):
+        # A future resolved elsewhere must not kill the worker thread
+        try:
+            setter(value)
+        except InvalidStateError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self._max_queue_depth,
+                "requests": self._requests,
+                "batches": self._batches,
+                "errors": self._errors,
+                "avg_batch_size": (sum(n * c for n, c in self._batch_sizes.items()) / self._batches) if self._batches else 0.0,
+                "batch_sizes": {str(n): c for n, c in sorted(self._batch_sizes.items())},
+                "model_seconds": round(self._busy_seconds, 3),
+                "max_batch": self.max_batch,
+                "max_wait_ms": self.max_wait * 1000.0,
+            }
+
+
+# ---------- Prediction cache ----------
+class PredictionCache:
+    """LRU of prediction results keyed by a hash of the resized input pixels.
+
+    Bounded by entry count and by an estimate of the memory the entries
+    hold. `fingerprint` returns the serving model's fingerprint (see
+    ReloadingBackend); when it changes, i.e. the model was reloaded, all
+    entries are dropped.
+    """
+
+    def __init__(self, fingerprint, max_entries=1024, max_bytes=16 * 2**20):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._fingerprint = fingerprint()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def key(img):
+        """Hash of a resized RGB image's uint8 pixels (4x less to hash than the float32 input)."""
+        return hashlib.sha256(np.asarray(img)).digest() + repr(img.size).encode()
+
+    @staticmethod
+    def _entry_bytes(key, result):
+        return sys.getsizeof(key) + sys.getsizeof(result) + sum(
+            sys.getsizeof(v) + (sum(sys.getsizeof(item) for item in v) if isinstance(v, list) else 0)
+            for v in result.values()
+        )
+
+    def _check_model(self):
+        fingerprint = self.fingerprint()
+        if fingerprint != self._fingerprint:
+            self._entries.clear()
+            self._bytes = 0
+            self._fingerprint = fingerprint
+            self._invalidations += 1
+
+    def get(self, key):
+        with self._lock:
+            self._check_model()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key, result, fingerprint=None):
+        """Store result; pass the model fingerprint read before predicting.
+
+        If the model was reloaded since, the result may come from either
+        model, so it is not stored.
+        """
+        size = self._entry_bytes(key, result)
+        with self._lock:
+            self._check_model()
+            if fingerprint is not None and fingerprint != self._fingerprint:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self._evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
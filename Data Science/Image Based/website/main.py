@@ -3,16 +3,11 @@ from flask_login import LoginManager, UserMixin, login_user, login_required, log
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
 import numpy as np
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.image import load_img, img_to_array
-from tensorflow import keras
+from inference import MODEL_FILES, MicroBatcher, PredictionCache, ReloadingBackend, class_names, image_to_array, open_image
 
 
 import os
 
-class_names = ['Acne And Rosacea Photos', 'Actinic Keratosis Basal Cell Carcinoma And Other Malignant Lesions', 'Atopic Dermatitis Photos', 'Ba  Cellulitis', 'Ba Impetigo', 'Benign', 'Bullous Disease Photos', 'Cellulitis Impetigo And Other Bacterial Infections', 'Eczema Photos', 'Exanthems And Drug Eruptions', 'Fu Athlete Foot', 'Fu Nail Fungus', 'Fu Ringworm', 'Hair Loss Photos Alopecia And Other Hair Diseases', 'Herpes Hpv And Other Stds Photos', 'Light Diseases And Disorders Of Pigmentation', 'Lupus And Other Connective Tissue Diseases', 'Malignant', 'Melanoma Skin Cancer Nevi And Moles', 'Rashes']
-
 treatment_suggestions = {
     "Acne And Rosacea Photos": "Common approaches include topical retinoids, benzoyl peroxide, oral antibiotics, or azelaic acid. Please consult a dermatologist.",
     "Actinic Keratosis Basal Cell Carcinoma And Other Malignant Lesions": "May require cryotherapy, topical chemotherapy (5-FU), imiquimod, or surgical excision. Urgent dermatologist referral is recommended.",
@@ -37,11 +32,28 @@ treatment_suggestions = {
 }
 
 
-UPLOAD_FOLDER = 'uploads'
-
 app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-model = load_model("static/skin_disease_model_tf.keras")
+# MODEL_BACKEND: keras (default), tflite-fp16, tflite-int8 or onnx; see export_model.py
+app.config["MODEL_BACKEND"] = os.environ.get("MODEL_BACKEND", "keras")
+app.config["MODEL_PATH"] = os.environ.get("MODEL_PATH") or MODEL_FILES.get(app.config["MODEL_BACKEND"])
+# A new model file (same path) is picked up by the next batch, without a restart
+model = ReloadingBackend(app.config["MODEL_BACKEND"], app.config["MODEL_PATH"])
+
+# Concurrent /predict requests share one model call: a batch is sent once it
+# holds PREDICT_MAX_BATCH images or its first image has waited PREDICT_MAX_WAIT_MS
+app.config["PREDICT_MAX_BATCH"] = int(os.environ.get("PREDICT_MAX_BATCH", 16))
+app.config["PREDICT_MAX_WAIT_MS"] = float(os.environ.get("PREDICT_MAX_WAIT_MS", 10))
+batcher = MicroBatcher(model.predict_on_batch,
+                       max_batch=app.config["PREDICT_MAX_BATCH"],
+                       max_wait_ms=app.config["PREDICT_MAX_WAIT_MS"])
+
+# Re-uploads of the same photo skip the model; entries are dropped when the model is reloaded
+app.config["PREDICT_CACHE_ENTRIES"] = int(os.environ.get("PREDICT_CACHE_ENTRIES", 1024))
+app.config["PREDICT_CACHE_MB"] = float(os.environ.get("PREDICT_CACHE_MB", 16))
+app.config["PREDICT_TOP_K"] = int(os.environ.get("PREDICT_TOP_K", 5))
+prediction_cache = PredictionCache(lambda: model.fingerprint,
+                                   max_entries=app.config["PREDICT_CACHE_ENTRIES"],
+                                   max_bytes=int(app.config["PREDICT_CACHE_MB"] * 2**20))
 
 app.secret_key = "supersecretkey"
 
@@ -59,20 +71,26 @@ login_manager = LoginManager()
 login_manager.init_app(app)
 login_manager.login_view = "login"
 
-def predict_image(img_path, target_size=(224, 224)):
-    # Load and preprocess
-    img = load_img(img_path, target_size=target_size)
-    x = img_to_array(img)
-    x = np.expand_dims(x, axis=0)  # add batch dimension
-    x = keras.applications.efficientnet.preprocess_input(x)
+def predict_image(img, target_size=(224, 224)):
+    # Decode and preprocess (img is an opened, not yet decoded, PIL image)
+    x, img = image_to_array(img, target_size)
 
-    # Predict
-    preds = model.predict(x)
-    pred_class_idx = np.argmax(preds, axis=1)[0]
-    pred_class_prob = float(preds[0][pred_class_idx])
-    pred_class_name = class_names[pred_class_idx]
+    # Same pixels as an earlier upload: reuse its prediction
+    key = prediction_cache.key(img)
+    fingerprint = model.fingerprint
+    result = prediction_cache.get(key)
+    if result is None:
+        # Predict (batched with any other requests in flight)
+        preds = batcher.predict(x)
+        top = np.argsort(preds)[::-1][:app.config["PREDICT_TOP_K"]]
+        result = {
+            "class": class_names[top[0]],
+            "confidence": float(preds[top[0]]),
+            "top_k": [(class_names[i], float(preds[i])) for i in top],
+        }
+        prediction_cache.put(key, result, fingerprint)
 
-    return pred_class_name, pred_class_prob,img
+    return result["class"], result["confidence"],img
 
 
 @login_manager.user_loader
@@ -120,7 +138,7 @@ def dashboard():
     return render_template("dashboard.html")
 
 import base64
-import imghdr
+from PIL import Image
 
 @app.route('/predict', methods=['POST'])
 @login_required
@@ -132,32 +150,32 @@ def predict():
     if file.filename == '':
         return jsonify({"error": "No file selected"}), 400
 
-    # Save temporarily
-    os.makedirs("uploads", exist_ok=True)
-    temp_path = os.path.join("uploads", file.filename)
-    file.save(temp_path)
-    img_format = imghdr.what(temp_path)
-    if img_format is None:
-        os.remove(temp_path)
+    # Everything below works on the uploaded bytes; nothing touches the disk
+    img_bytes = file.read()
+    img = open_image(img_bytes)
+    if img is None:
         return jsonify({"error": "Unsupported image format"}), 400
 
-    # Convert image to base64
-    with open(temp_path, "rb") as f:
-        img_bytes = f.read()
+    # The preview is the upload itself, so it needs no decode or re-encode
     img_base64 = base64.b64encode(img_bytes).decode("utf-8")
-
-    # Pick correct MIME type
-    img_data = f"data:image/{img_format};base64,{img_base64}"
+    mime_type = Image.MIME.get(img.format, f"image/{img.format.lower()}")
+    img_data = f"data:{mime_type};base64,{img_base64}"
 
     # Predict
-    predicted_class, confidence,img = predict_image(temp_path)
-   
-    # Clean up file
-    os.remove(temp_path)
+    try:
+        predicted_class, confidence, img = predict_image(img)
+    except OSError:
+        return jsonify({"error": "Could not decode image"}), 400
 
     return render_template("dashboard.html",predicted_class=predicted_class, treatment= treatment_suggestions[predicted_class],img_data=img_data)
 
 
+@app.route("/metrics")
+@login_required
+def metrics():
+    return jsonify({"model": model.stats(), "predict_batcher": batcher.stats(), "prediction_cache": prediction_cache.stats()})
+
+
 @app.route("/logout")
 @login_required
 def logout():
@@ -0,0 +1,189 @@
+"""Tests for the serving helpers that don't need a model: python -m unittest test_inference"""
+
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from inference import MicroBatcher, PredictionCache, ReloadingBackend, image_to_array
+
+
+class MicroBatcherTests(unittest.TestCase):
+    def test_concurrent_requests_share_a_batch(self):
+        batcher = MicroBatcher(lambda batch: batch * 2, max_batch=8, max_wait_ms=200)
+        futures = [batcher.submit(np.full(3, i, dtype=np.float32)) for i in range(5)]
+        for i, future in enumerate(futures):
+            np.testing.assert_array_equal(future.result(5), np.full(3, 2 * i))
+        stats = batcher.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["batches"], 1)
+        self.assertEqual(stats["batch_sizes"], {"5": 1})
+
+    def test_model_errors_reach_every_caller(self):
+        def fail(batch):
+            raise RuntimeError("model crashed")
+
+        batcher = MicroBatcher(fail, max_wait_ms=1)
+        with self.assertRaisesRegex(RuntimeError, "model crashed"):
+            batcher.predict(np.zeros(3), timeout=5)
+        self.assertEqual(batcher.stats()["errors"], 1)
+
+    def test_cancelled_and_resolved_futures_do_not_stop_the_worker(self):
+        gate = threading.Event()
+
+        def predict(batch):
+            gate.wait(5)
+            return batch + 1
+
+        batcher = MicroBatcher(predict, max_batch=1, max_wait_ms=1)
+        running = batcher.submit(np.zeros(2))
+        time.sleep(0.05)
+        queued = batcher.submit(np.zeros(2))
+        self.assertTrue(queued.cancel())
+        running.set_result("resolved elsewhere")
+        gate.set()
+
+        np.testing.assert_array_equal(batcher.predict(np.ones(2), timeout=5), [2, 2])
+        self.assertTrue(batcher._thread.is_alive())
+
+
+def noisy_photo(width, height, seed=0):
+    """A smooth gradient with blobs and strong sensor-like noise, the worst case for a reduced decode."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width]
+    pixels = np.stack([xx / width * 200 + 20, yy / height * 180 + 30, (xx + yy) / (width + height) * 150 + 50], -1)
+    for _ in range(20):
+        cy, cx, r = rng.integers(0, height), rng.integers(0, width), rng.integers(20, height // 4)
+        blob = (yy - cy) ** 2 + (xx - cx) ** 2 < r * r
+        pixels[blob] = pixels[blob] * 0.5 + rng.integers(0, 255, 3) * 0.5
+    return np.clip(pixels + rng.normal(0, 25, pixels.shape), 0, 255).astype(np.uint8)
+
+
+class PreprocessingParityTests(unittest.TestCase):
+    """image_to_array against a full-size decode + bilinear resize, the baseline it approximates."""
+
+    # uint8 levels; the reduced JPEG decode averages blocks in the DCT, so it
+    # can't be bit-exact, but stays well under the noise of a real photo
+    MEAN_TOLERANCE = 1.0
+    MAX_TOLERANCE = 16
+
+    def baseline(self, data):
+        img = Image.open(io.BytesIO(data)).convert("RGB")
+        return np.asarray(img.resize((224, 224), Image.BILINEAR), dtype=np.float32)
+
+    def encode(self, pixels, fmt):
+        buf = io.BytesIO()
+        Image.fromarray(pixels).save(buf, fmt, quality=90)
+        return buf.getvalue()
+
+    def test_reduced_jpeg_decode_is_within_tolerance(self):
+        data = self.encode(noisy_photo(2000, 1500), "JPEG")
+        img = Image.open(io.BytesIO(data))
+        x, _ = image_to_array(img)
+        self.assertLess(img.size[0], 2000)  # the draft decode did kick in
+        diff = np.abs(x - self.baseline(data))
+        self.assertLess(diff.mean(), self.MEAN_TOLERANCE)
+        self.assertLessEqual(diff.max(), self.MAX_TOLERANCE)
+
+    def test_other_formats_match_exactly(self):
+        data = self.encode(noisy_photo(600, 450), "PNG")
+        x, _ = image_to_array(Image.open(io.BytesIO(data)))
+        np.testing.assert_array_equal(x, self.baseline(data))
+
+
+class FakeBackend:
+    """Answers with the contents of the model file it was loaded from."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.weights = f.read()
+        if not self.weights:
+            raise ValueError("empty model file")
+
+    def predict_on_batch(self, batch):
+        return [self.weights] * len(batch)
+
+
+class ModelFileTests(unittest.TestCase):
+    def setUp(self):
+        handle, self.model_path = tempfile.mkstemp()
+        os.write(handle, b"weights")
+        os.close(handle)
+        self.addCleanup(os.remove, self.model_path)
+        patcher = mock.patch("inference.load_backend", side_effect=lambda name, path, num_threads: FakeBackend(path))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.model = ReloadingBackend("onnx", self.model_path)
+
+    def retrain(self, weights):
+        with open(self.model_path, "wb") as f:
+            f.write(weights)
+
+    def test_changing_the_model_file_reloads_it(self):
+        self.assertEqual(self.model.predict_on_batch([0]), [b"weights"])
+        self.retrain(b"retrained")
+        self.assertEqual(self.model.predict_on_batch([0]), [b"retrained"])
+        self.assertEqual(self.model.stats()["reloads"], 1)
+
+    def test_a_file_that_fails_to_load_keeps_the_old_model(self):
+        self.retrain(b"")
+        self.assertEqual(self.model.predict_on_batch([0]), [b"weights"])
+        self.assertEqual(self.model.stats()["reload_errors"], 1)
+        self.retrain(b"retrained")
+        self.assertEqual(self.model.predict_on_batch([0]), [b"retrained"])
+
+    def test_cache_follows_the_loaded_model(self):
+        cache = PredictionCache(lambda: self.model.fingerprint)
+        cache.put(b"a", {"class": "A"})
+        self.retrain(b"retrained")
+        # The file changed but the old model still serves, so its results stay valid
+        self.assertEqual(cache.get(b"a"), {"class": "A"})
+
+        fingerprint = self.model.fingerprint
+        self.model.predict_on_batch([0])
+        self.assertIsNone(cache.get(b"a"))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+        # A result that may come from the old model is not stored
+        cache.put(b"b", {"class": "B"}, fingerprint)
+        self.assertIsNone(cache.get(b"b"))
+        cache.put(b"b", {"class": "B"}, self.model.fingerprint)
+        self.assertEqual(cache.get(b"b"), {"class": "B"})
+
+
+class PredictionCacheTests(unittest.TestCase):
+    def fingerprint(self):
+        return "model-1"
+
+    def test_key_is_the_pixels(self):
+        red = Image.new("RGB", (4, 4), "red")
+        self.assertEqual(PredictionCache.key(red), PredictionCache.key(Image.new("RGB", (4, 4), "red")))
+        self.assertNotEqual(PredictionCache.key(red), PredictionCache.key(Image.new("RGB", (4, 4), "blue")))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = PredictionCache(self.fingerprint, max_entries=2)
+        cache.put(b"a", {"class": "A"})
+        cache.put(b"b", {"class": "B"})
+        self.assertEqual(cache.get(b"a"), {"class": "A"})
+        cache.put(b"c", {"class": "C"})
+        self.assertIsNone(cache.get(b"b"))
+        self.assertEqual(cache.get(b"a"), {"class": "A"})
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_byte_budget_bounds_the_cache(self):
+        result = {"class": "A", "top_k": [("A", 0.5)] * 10}
+        size = PredictionCache._entry_bytes(b"k0", result)
+        cache = PredictionCache(self.fingerprint, max_entries=100, max_bytes=3 * size)
+        for i in range(10):
+            cache.put(f"k{i}".encode(), dict(result))
+        self.assertLessEqual(cache.stats()["bytes"], 3 * size)
+        self.assertEqual(cache.stats()["entries"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
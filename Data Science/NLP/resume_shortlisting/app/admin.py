@@ -1,16 +1,21 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import JobPost,JobApplication,JobSeekerProfile,CompanyProfile
+from .models import JobPost,JobApplication,JobSeekerProfile,CompanyProfile,ApplicationSkill
 
 class JobPostAdmin(admin.ModelAdmin):
     list_display = ('job_title', 'company', 'job_type', 'experience', 'salary', 'posted_at', 'is_active')
     list_filter = ('job_type', 'experience', 'is_active')
     search_fields = ('job_title', 'company__name')
 
+class ApplicationSkillInline(admin.TabularInline):
+    model = ApplicationSkill
+    extra = 0
+
 class JobApplicationAdmin(admin.ModelAdmin):
-    list_display = ('job', 'job_seeker', 'resume', 'applied_at')
-    list_filter = ('job__job_type', 'job__experience')
+    list_display = ('job', 'job_seeker', 'resume', 'applied_at', 'ats_score', 'scoring_status', 'experience_years', 'education_tier')
+    list_filter = ('job__job_type', 'job__experience', 'scoring_status', 'education_tier')
+    inlines = [ApplicationSkillInline]
     search_fields = ('job__job_title', 'job_seeker__user__username')
     actions = ['approve_applications', 'reject_applications']
 
@@ -4,72 +4,280 @@ import os
 import re
 import logging
 import spacy
-import pdfplumber
-import docx
+import numpy as np
 from rapidfuzz import fuzz, process
 from collections import Counter
 
+from .ats_timing import stage
+from .minhash import minhash_signature
+from .nlp_service import NLPServiceError, get_service_client
+from .resume_cache import file_sha256, get_default_cache
+from .skills import get_skill_matcher
+from .text_extraction import extract_file
 
-# Load Spacy NLP model
-nlp = spacy.load("en_core_web_sm")
+
+# en_core_web_sm ships senter disabled (the parser sets sentence boundaries), so
+# excluding it only skips loading its weights; resume parsing runs the same
+# components as before. Every other component feeds a feature: tagger and
+# attribute_ruler (pos_), lemmatizer (lemma_), parser (noun_chunks), ner (ents).
+UNUSED_COMPONENTS = ["senter"]
+
+# The JD only needs lemmas and stop-word flags, not dependencies or entities
+JD_DISABLED_COMPONENTS = ["parser", "ner"]
+
+_nlp = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_nlp():
+    """Load the Spacy NLP model once per process, on first use."""
+    global _nlp
+    if _nlp is None:
+        _nlp = spacy.load("en_core_web_sm", exclude=UNUSED_COMPONENTS)
+    return _nlp
 
 # ---------- File Text Extraction ----------
 def extract_text(path: str) -> str:
-    """Extract raw text from PDF, DOCX, or TXT files."""
+    """Extract raw text from PDF, DOCX, or TXT files (see text_extraction for backends and limits)."""
     ext = os.path.splitext(path)[1].lower()
     logging.info(f"Extracting text from file: {path} (type: {ext})")
 
-    if ext == ".pdf":
-        text = ""
-        with pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text() or ""
-                text += page_text + "\n"
-        return text.strip()
-
-    elif ext in (".docx",):
-        doc = docx.Document(path)
-        return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
-
-    elif ext == ".txt":
-        return open(path, encoding="utf-8", errors="ignore").read()
-
-    else:
-        raise ValueError(f"Unsupported format: {ext}")
+    with stage("extract_text", path=path, ext=ext) as info:
+        text = extract_file(path, info=info)
+        info["chars"] = len(text)
+    return text
+
+
+# ---------- Parsed Resume ----------
+class ParsedResume:
+    """Everything the scorer reads from a resume, taken from one spaCy parse."""
+
+    # SHA-256 of the source file, set by load_resumes when the feature cache is on
+    digest = None
+
+    def __init__(self, text: str, skill_candidates: set, education: list, experience_years: int):
+        self.text = text
+        self.skill_candidates = skill_candidates
+        self.education = education
+        self.experience_years = experience_years
+
+    @classmethod
+    def from_doc(cls, doc) -> "ParsedResume":
+        with stage("features", tokens=len(doc)) as info:
+            parsed = cls(
+                text=doc.text,
+                skill_candidates=_skill_candidates(doc),
+                education=_education(doc),
+                experience_years=extract_experience_years(doc.text),
+            )
+            info["candidates"] = len(parsed.skill_candidates)
+            info["education"] = len(parsed.education)
+        return parsed
+
+    def to_dict(self) -> dict:
+        return {
+            "text": self.text,
+            "skill_candidates": sorted(self.skill_candidates),
+            "education": self.education,
+            "experience_years": self.experience_years,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ParsedResume":
+        return cls(
+            text=data["text"],
+            skill_candidates=set(data["skill_candidates"]),
+            education=data["education"],
+            experience_years=data["experience_years"],
+        )
+
+
+def parse_resume(text: str) -> ParsedResume:
+    """Parse resume text once and extract every feature from that parse."""
+    if get_service_client():
+        return parse_resumes([text])[0]
+    with stage("nlp_parse", chars=len(text)) as info:
+        doc = get_nlp()(text)
+        info["tokens"] = len(doc)
+    return ParsedResume.from_doc(doc)
+
+
+def parse_resumes(texts, n_process: int = 1, batch_size: int = 16) -> list:
+    """Parse many resumes through nlp.pipe, optionally across processes.
+
+    When settings.ATS_NLP_SERVICE is set the shared NLP service does the
+    parsing and this process never loads the model unless the service
+    fails; then it parses in-process, or raises NLPServiceError if
+    settings.ATS_NLP_SERVICE_FALLBACK is off.
+    """
+    texts = list(texts)
+    client = get_service_client()
+    if client and texts:
+        try:
+            with stage("nlp_service", op="parse_resumes", docs=len(texts)):
+                response = client.call("parse_resumes", texts=texts)
+            return [ParsedResume.from_dict(d) for d in response["resumes"]]
+        except NLPServiceError as exc:
+            if not client.fallback:
+                raise
+            logger.warning("NLP service unavailable, parsing in-process: %s", exc)
+    return _parse_resumes_local(texts, n_process, batch_size)
+
+
+def _parse_resumes_local(texts, n_process: int = 1, batch_size: int = 16) -> list:
+    with stage("nlp_parse_batch", docs=len(texts), chars=sum(len(t) for t in texts), n_process=n_process):
+        docs = get_nlp().pipe(texts, n_process=n_process, batch_size=batch_size)
+        return [ParsedResume.from_doc(doc) for doc in docs]
+
+
+def load_resume(resume_path: str, cache=None, digest: str = None) -> ParsedResume:
+    """Extract and parse a resume file, reusing cached features for identical bytes.
+
+    `digest` is the file's SHA-256 if the caller already computed it.
+    """
+    return load_resumes([resume_path], cache=cache, digests=[digest])[0]
+
+
+def load_resumes(resume_paths, n_process: int = 1, batch_size: int = 16, cache=None,
+                 skip_failed: bool = False, digests=None) -> list:
+    """Like load_resume for many files; cache misses are parsed in one nlp.pipe run.
+
+    `digests` may give known SHA-256s (None where unknown) so files aren't
+    hashed again. With skip_failed, a file that can't be read or extracted
+    comes back as None instead of failing the whole batch.
+    """
+    cache = cache or get_default_cache()
+    resume_paths = list(resume_paths)
+    resumes = [None] * len(resume_paths)
+    digests = list(digests) if digests is not None else [None] * len(resume_paths)
+    failed = set()
+
+    def skip(i, exc):
+        if not skip_failed:
+            raise exc
+        logger.warning("Skipping resume %s: %s: %s", resume_paths[i], type(exc).__name__, exc)
+        failed.add(i)
+
+    with stage("cache_lookup", files=len(resume_paths), enabled=bool(cache)) as info:
+        for i, path in enumerate(resume_paths):
+            if not cache:
+                continue
+            try:
+                digests[i] = digests[i] or file_sha256(path)
+            except OSError as exc:
+                skip(i, exc)
+                continue
+            hit = cache.get(digests[i])
+            if hit is not None:
+                resumes[i] = ParsedResume.from_dict(hit)
+        info["hits"] = sum(r is not None for r in resumes)
+
+    misses = []
+    texts = []
+    for i, path in enumerate(resume_paths):
+        if resumes[i] is not None or i in failed:
+            continue
+        try:
+            texts.append(extract_text(path))
+        except Exception as exc:
+            skip(i, exc)
+            continue
+        misses.append(i)
+
+    for i, parsed in zip(misses, parse_resumes(texts, n_process=n_process, batch_size=batch_size)):
+        resumes[i] = parsed
+        if cache:
+            cache.put(digests[i], parsed.to_dict())
+    for resume, digest in zip(resumes, digests):
+        if resume is not None:
+            resume.digest = digest
+    return resumes
+
+
+def _as_parsed(resume) -> ParsedResume:
+    return resume if isinstance(resume, ParsedResume) else parse_resume(resume)
 
 
 # ---------- NLP-based Extractors ----------
-def extract_skills(text: str, jd_keywords=None) -> set:
-    """Extract candidate skills from text and match against JD keywords if provided."""
-    doc = nlp(text.lower())
+def _skill_candidates(doc) -> set:
+    # Read from the single cased parse that also feeds _education. The original
+    # extractor tagged a lowercased copy; with casing, capitalised tool names
+    # are more often PROPN and noun chunks can split differently, so candidates
+    # (and scores) differ somewhat from scores computed before parse-once. Lemmas
+    # are lowercased to keep comparing against the lowercased JD keywords.
     candidates = set()
 
     # Single tokens
     for token in doc:
         if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop:
-            candidates.add(token.lemma_.strip())
+            candidates.add(token.lemma_.lower().strip())
 
     # Multi-word noun chunks
     for chunk in doc.noun_chunks:
-        candidates.add(chunk.lemma_.strip())
+        candidates.add(chunk.lemma_.lower().strip())
+
+    return candidates
+
+
+def get_skill_extractor() -> str:
+    """'nlp' (noun candidates + fuzzy match) or 'taxonomy' (skills.py), from settings.ATS_SKILL_EXTRACTOR."""
+    from django.conf import settings
+
+    return getattr(settings, "ATS_SKILL_EXTRACTOR", "nlp") if settings.configured else "nlp"
+
+
+def extract_skills(resume, jd_keywords=None, extractor: str = "nlp") -> set:
+    """Extract candidate skills from text (or a ParsedResume) and match against JD keywords if provided."""
+    if extractor == "taxonomy":
+        text = resume.text if isinstance(resume, ParsedResume) else resume
+        with stage("skill_taxonomy", chars=len(text)) as info:
+            found = get_skill_matcher().find(text)
+            info["found"] = len(found)
+        return found & set(jd_keywords) if jd_keywords else found
+    elif extractor != "nlp":
+        raise ValueError(f"Unknown skill extractor: {extractor}")
+
+    candidates = _as_parsed(resume).skill_candidates
 
     # Match against JD keywords
     if jd_keywords:
-        matched = set()
+        return match_skills(candidates, jd_keywords)
+
+    return set(candidates)
+
+
+def match_skills(candidates, jd_keywords, threshold: float = 85) -> set:
+    """JD keywords that some candidate fuzzy-matches with token_sort_ratio > threshold.
+
+    Equivalent to calling process.extractOne(candidate, jd_keywords) per
+    candidate, but scores every remaining candidate against every keyword in
+    one multithreaded process.cdist call. Candidates that are themselves a
+    keyword match exactly and skip the fuzzy pass.
+    """
+    keywords = list(jd_keywords)
+    matched = set()
+    fuzzy = []
+    with stage("skill_match", candidates=len(candidates), keywords=len(keywords)) as info:
         for c in candidates:
-            result = process.extractOne(c, jd_keywords, scorer=fuzz.token_sort_ratio)
-            if result:
-                match, score, _ = result
-                if score > 85:
-                    matched.add(match)
-        return matched
+            if c in jd_keywords:
+                matched.add(c)
+            else:
+                fuzzy.append(c)
 
-    return candidates
+        if fuzzy and keywords:
+            scores = process.cdist(fuzzy, keywords, scorer=fuzz.token_sort_ratio, dtype=np.float64, workers=-1)
+            # argmax takes the first best keyword, the same tie-break as extractOne
+            best = scores.argmax(axis=1)
+            for row, col in enumerate(best):
+                if scores[row, col] > threshold:
+                    matched.add(keywords[col])
+        info["matched"] = len(matched)
 
+    return matched
 
-def extract_education(text: str) -> list:
-    """Extract institutions and degrees from resume text."""
-    doc = nlp(text)
+
+def _education(doc) -> list:
     results = []
 
     # Institutions
@@ -83,7 +291,7 @@ def extract_education(text: str) -> list:
     # Degrees
     degs = re.findall(
         r"(bachelor|master|phd|mba|b\.sc|m\.sc|ba|ma|ms|bs|btech|mtech)",
-        text,
+        doc.text,
         flags=re.I,
     )
     for d in degs:
@@ -92,6 +300,11 @@ def extract_education(text: str) -> list:
     return results
 
 
+def extract_education(resume) -> list:
+    """Extract institutions and degrees from resume text (or a ParsedResume)."""
+    return list(_as_parsed(resume).education)
+
+
 def extract_experience_years(text: str) -> int:
     """Extract maximum years of experience mentioned in text."""
     matches = re.findall(r"(\d+)\s*(?:\+|-)?\s*(years?|yrs?)", text, flags=re.I)
@@ -103,7 +316,26 @@ def extract_experience_years(text: str) -> int:
 
 def extract_jd_keywords(jd_text: str) -> set:
     """Extract important keywords from Job Description."""
-    doc = nlp(jd_text.lower())
+    client = get_service_client()
+    if client:
+        try:
+            with stage("nlp_service", op="jd_keywords", chars=len(jd_text)):
+                return set(client.call("jd_keywords", text=jd_text)["keywords"])
+        except NLPServiceError as exc:
+            if not client.fallback:
+                raise
+            logger.warning("NLP service unavailable, parsing in-process: %s", exc)
+    return _extract_jd_keywords_batch([jd_text])[0]
+
+
+def _extract_jd_keywords_batch(jd_texts, batch_size: int = 16) -> list:
+    jd_texts = list(jd_texts)
+    with stage("jd_parse", docs=len(jd_texts), chars=sum(len(t) for t in jd_texts)):
+        docs = get_nlp().pipe((t.lower() for t in jd_texts), batch_size=batch_size, disable=JD_DISABLED_COMPONENTS)
+        return [_jd_keywords(doc) for doc in docs]
+
+
+def _jd_keywords(doc) -> set:
     tokens = [t.lemma_ for t in doc if t.is_alpha and not t.is_stop]
     freq = Counter(tokens)
     keywords = set([w for w, _ in freq.most_common(60)])
@@ -113,51 +345,138 @@ def extract_jd_keywords(jd_text: str) -> set:
     return {w for w in keywords if w not in blacklist}
 
 
+def extract_education_tier(jd_text: str) -> str:
+    """Highest degree a Job Description asks for: 'phd', 'master', 'bachelor' or ''."""
+    jd_lower = jd_text.lower()
+    for tier in ("phd", "master", "bachelor"):
+        if tier in jd_lower:
+            return tier
+    return ""
+
+
+# ---------- Parsed Job Description ----------
+class ParsedJD:
+    """The parts of a Job Description the scorer reads; cheap to store on JobPost."""
+
+    def __init__(self, keywords: set, experience_years: int, education_tier: str, skills: set = frozenset()):
+        self.keywords = keywords
+        self.experience_years = experience_years
+        self.education_tier = education_tier
+        # Taxonomy skills, compared instead of keywords by the 'taxonomy' extractor
+        self.skills = skills
+
+
+def parse_jd(jd_text: str) -> ParsedJD:
+    return ParsedJD(
+        keywords=extract_jd_keywords(jd_text),
+        experience_years=extract_experience_years(jd_text),
+        education_tier=extract_education_tier(jd_text),
+        skills=get_skill_matcher().find(jd_text),
+    )
+
+
+def _as_parsed_jd(jd) -> ParsedJD:
+    return jd if isinstance(jd, ParsedJD) else parse_jd(jd)
+
+
+# Degrees that satisfy each JD education tier
+EDUCATION_TIERS = {
+    "phd": ("phd",),
+    "master": ("master", "phd"),
+    "bachelor": ("bachelor", "master", "phd"),
+}
+
+
+# ---------- Stored Resume Features ----------
+def resume_education_tier(resume: ParsedResume) -> str:
+    """Highest tier ('phd', 'master', 'bachelor' or '') the scorer would credit the resume with."""
+    entries = [str(e).lower() for e in resume.education]
+    for tier in ("phd", "master", "bachelor"):
+        if any(tier in e for e in entries):
+            return tier
+    return ""
+
+
+def resume_features(resume: ParsedResume) -> dict:
+    """The JD-independent resume features stored on JobApplication for filtering in SQL."""
+    return {
+        "skills": sorted(get_skill_matcher().find(resume.text)),
+        "experience_years": resume.experience_years,
+        "education_tier": resume_education_tier(resume),
+        "minhash": minhash_signature(resume.text),
+        # Lets a JD edit rescore from the cache without touching the file (see scoring.py)
+        "digest": resume.digest or "",
+    }
+
+
 # ---------- ATS Scoring ----------
-def ats_score(resume_path: str, jd_text: str) -> float:
-    """Takes a resume file path + JD text string, returns ATS result score (0-100)."""
-    resume_text = extract_text(resume_path)
+def ats_score(resume_path: str, jd, extractor: str = None) -> float:
+    """Takes a resume file path + JD text (or ParsedJD), returns ATS result score (0-100)."""
+    with stage("ats_score", path=resume_path) as info:
+        info["score"] = score = score_resume(load_resume(resume_path), jd, extractor)
+    return score
 
-    # Keyword & Skills
-    jd_keywords = extract_jd_keywords(jd_text)
-    resume_skills = extract_skills(resume_text, jd_keywords)
 
-    matched_keywords = resume_skills & jd_keywords
-    keyword_score = len(matched_keywords) / len(jd_keywords) if jd_keywords else 0
-    skill_score = len(matched_keywords) / (len(resume_skills) or 1)
+def ats_score_with_features(resume_path: str, jd, extractor: str = None, digest: str = None) -> tuple:
+    """Like ats_score, but also returns resume_features() from the same parse."""
+    with stage("ats_score", path=resume_path) as info:
+        resume = load_resume(resume_path, digest=digest)
+        info["score"] = score = score_resume(resume, jd, extractor)
+    return score, resume_features(resume)
 
-    # Experience
-    resume_years = extract_experience_years(resume_text)
-    jd_years = extract_experience_years(jd_text)
-    exp_score = min(1.0, resume_years / jd_years) if jd_years else (resume_years / 10.0)
 
-    # Education
-    resume_edu = extract_education(resume_text)
-    edu_score = 0.0
-    jd_lower = jd_text.lower()
+def ats_score_batch(resume_paths, jd, n_process: int = 1, batch_size: int = 16, extractor: str = None) -> list:
+    """Score many resumes against one JD, parsing them in a single nlp.pipe run."""
+    jd = _as_parsed_jd(jd)
+    return [
+        score_resume(resume, jd, extractor)
+        for resume in load_resumes(resume_paths, n_process=n_process, batch_size=batch_size)
+    ]
 
-    if "phd" in jd_lower:
-        edu_score = 1.0 if any("phd" in str(e).lower() for e in resume_edu) else 0.0
-    elif "master" in jd_lower:
-        edu_score = 1.0 if any(
-            "master" in str(e).lower() or "phd" in str(e).lower()
-            for e in resume_edu
-        ) else 0.0
-    elif "bachelor" in jd_lower:
-        edu_score = 1.0 if any(
-            "bachelor" in str(e).lower()
-            or "master" in str(e).lower()
-            or "phd" in str(e).lower()
+
+# Share of each component in the overall score
+SKILL_WEIGHT = 0.5
+EXPERIENCE_WEIGHT = 0.3
+EDUCATION_WEIGHT = 0.2
+
+
+def experience_score(resume: ParsedResume, jd: ParsedJD) -> float:
+    resume_years = resume.experience_years
+    jd_years = jd.experience_years
+    return min(1.0, resume_years / jd_years) if jd_years else (resume_years / 10.0)
+
+
+def education_score(resume: ParsedResume, jd: ParsedJD) -> float:
+    resume_edu = resume.education
+    if jd.education_tier:
+        accepted = EDUCATION_TIERS[jd.education_tier]
+        return 1.0 if any(
+            any(degree in str(e).lower() for degree in accepted)
             for e in resume_edu
         ) else 0.0
     elif resume_edu:
-        edu_score = 0.8
+        return 0.8
+    return 0.0
+
+
+def score_resume(resume: ParsedResume, jd, extractor: str = None) -> float:
+    """Score an already parsed resume against JD text (or ParsedJD), returns ATS result score (0-100)."""
+    jd = _as_parsed_jd(jd)
+    extractor = extractor or get_skill_extractor()
+
+    # Keyword & Skills
+    jd_keywords = set(jd.skills) if extractor == "taxonomy" else jd.keywords
+    resume_skills = extract_skills(resume, jd_keywords, extractor)
+
+    matched_keywords = resume_skills & jd_keywords
+    keyword_score = len(matched_keywords) / len(jd_keywords) if jd_keywords else 0
+    skill_score = len(matched_keywords) / (len(resume_skills) or 1)
 
     # Weighted Overall Score
     overall = (
-        0.5 * skill_score +
-        0.3 * exp_score +
-        0.2 * edu_score
+        SKILL_WEIGHT * skill_score +
+        EXPERIENCE_WEIGHT * experience_score(resume, jd) +
+        EDUCATION_WEIGHT * education_score(resume, jd)
     )
 
 
@@ -0,0 +1,66 @@
+# app/ats_timing.py
+
+import os
+import json
+import math
+import time
+import logging
+from contextlib import contextmanager
+
+
+# One JSON object per line; settings.LOGGING routes this logger to ATS_TIMING_LOG
+logger = logging.getLogger("app.ats_timing")
+
+
+def timing_enabled() -> bool:
+    from django.conf import settings
+
+    if settings.configured:
+        return bool(getattr(settings, "ATS_TIMING", False))
+    return os.environ.get("ATS_TIMING") == "1"
+
+
+@contextmanager
+def stage(name: str, **sizes):
+    """Time a block of the ATS pipeline and log its duration with input sizes.
+
+    Yields a dict the block can add sizes to once it knows them (pages,
+    characters, candidate counts, ...). Does nothing unless timing is enabled.
+    """
+    if not timing_enabled():
+        yield {}
+        return
+
+    info = dict(sizes)
+    start = time.perf_counter()
+    try:
+        yield info
+    finally:
+        record = {
+            "ts": round(time.time(), 3),
+            "stage": name,
+            "ms": round((time.perf_counter() - start) * 1000, 3),
+            "pid": os.getpid(),
+        }
+        record.update(info)
+        logger.info(json.dumps(record, default=str))
+
+
+def read_records(path: str):
+    """Parse a timing log, skipping lines that aren't timing records."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "stage" in record and "ms" in record:
+                yield record
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
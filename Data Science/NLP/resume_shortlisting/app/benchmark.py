@@ -0,0 +1,241 @@
+# app/benchmark.py
+
+import os
+import json
+import time
+import random
+import logging
+import resource
+from collections import defaultdict
+
+import docx
+
+from .skills import SKILL_TAXONOMY
+
+
+# ---------- Synthetic Corpus ----------
+SKILLS = sorted(SKILL_TAXONOMY)
+ROLES = ["Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer",
+         "Frontend Developer", "Machine Learning Engineer", "Data Analyst", "Full Stack Developer"]
+DEGREES = ["Bachelor of Technology", "Bachelor of Science", "Master of Science", "Master of Engineering",
+           "MBA", "PhD"]
+INSTITUTIONS = ["Anna University", "Stanford University", "Madras Institute of Technology",
+                "Loyola College", "Delhi School of Economics", "Georgia Institute of Technology"]
+VERBS = ["built", "designed", "led", "maintained", "optimised", "migrated", "shipped", "automated"]
+NOUNS = ["services", "pipelines", "dashboards", "APIs", "models", "platforms", "reports", "deployments",
+         "features", "integrations", "workflows", "test suites"]
+FILLER = ["with a focus on reliability", "for a team of eight engineers", "serving millions of requests",
+          "under tight deadlines", "across three regions", "in close collaboration with product"]
+
+
+def _sentence(rng: random.Random, skills: list) -> str:
+    return (f"{rng.choice(VERBS).capitalize()} {rng.choice(NOUNS)} using {rng.choice(skills)} "
+            f"and {rng.choice(skills)} {rng.choice(FILLER)}.")
+
+
+def synth_resume(rng: random.Random, words: int = 400) -> str:
+    """A resume-shaped text of roughly `words` words with skills, years and education."""
+    skills = rng.sample(SKILLS, 12)
+    lines = [
+        f"{rng.choice(ROLES)}",
+        "Summary",
+        f"{rng.choice(ROLES)} with {rng.randint(1, 15)} years of experience in {skills[0]} and {skills[1]}.",
+        "Skills",
+        ", ".join(skills),
+        "Experience",
+    ]
+    count = sum(len(line.split()) for line in lines)
+    while count < words:
+        line = _sentence(rng, skills)
+        lines.append(line)
+        count += len(line.split())
+    lines += [
+        "Education",
+        f"{rng.choice(DEGREES)}, {rng.choice(INSTITUTIONS)}",
+    ]
+    return "\n".join(lines)
+
+
+def synth_jd(rng: random.Random, words: int = 200) -> str:
+    skills = rng.sample(SKILLS, 8)
+    lines = [
+        f"We are hiring a {rng.choice(ROLES)}.",
+        f"Requirements: {rng.randint(1, 8)}+ years of experience and a {rng.choice(['bachelor', 'master', 'phd'])} degree.",
+        "Must have: " + ", ".join(skills) + ".",
+    ]
+    count = sum(len(line.split()) for line in lines)
+    while count < words:
+        line = "You will " + _sentence(rng, skills).lower()
+        lines.append(line)
+        count += len(line.split())
+    return "\n".join(lines)
+
+
+def write_txt(path: str, text: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(path: str, text: str) -> None:
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path: str, text: str, lines_per_page: int = 50, width: int = 95) -> None:
+    """A plain Helvetica text PDF, written by hand so no PDF library is needed."""
+    wrapped = []
+    for line in text.splitlines():
+        while len(line) > width:
+            cut = line.rfind(" ", 0, width)
+            cut = cut if cut > 0 else width
+            wrapped.append(line[:cut])
+            line = line[cut:].lstrip()
+        wrapped.append(line)
+    pages = [wrapped[i:i + lines_per_page] for i in range(0, len(wrapped), lines_per_page)] or [[]]
+
+    def escape(s):
+        return s.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    # Objects: 1 catalog, 2 pages, 3 font, then a (page, content) pair per page
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>", 3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    kids = []
+    for n, page_lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * n, 5 + 2 * n
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 10 Tf 14 TL 50 790 Td " + " ".join(f"({escape(l)}) '" for l in page_lines) + " ET"
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>")
+        objects[content_id] = f"<< /Length {len(stream.encode('latin-1'))} >>\nstream\n{stream}\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += f"{obj_id} 0 obj\n{objects[obj_id]}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for obj_id in sorted(objects):
+        out += f"{offsets[obj_id]:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+
+def generate_corpus(out_dir: str, resumes: int = 60, jds: int = 3, words: int = 400,
+                    formats=("pdf", "docx", "txt"), seed: int = 0) -> dict:
+    """Write resumes (cycling through `formats`) and JDs under out_dir, plus manifest.json.
+
+    The same seed and sizes always produce the same files, so golden scores
+    recorded for one corpus stay valid for a regenerated one.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(out_dir, "resumes"), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, "jds"), exist_ok=True)
+
+    manifest = {"seed": seed, "words": words, "resumes": [], "jds": []}
+    for i in range(resumes):
+        fmt = formats[i % len(formats)]
+        name = f"resume_{i:04d}.{fmt}"
+        WRITERS[fmt](os.path.join(out_dir, "resumes", name), synth_resume(rng, words))
+        manifest["resumes"].append(name)
+    for i in range(jds):
+        name = f"jd_{i:02d}.txt"
+        write_txt(os.path.join(out_dir, "jds", name), synth_jd(rng))
+        manifest["jds"].append(name)
+
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ---------- Runner ----------
+class TimingCollector(logging.Handler):
+    """Keeps app.ats_timing records in memory instead of writing the timing log."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        try:
+            self.records.append(json.loads(record.getMessage()))
+        except ValueError:
+            pass
+
+
+def peak_rss_mb() -> dict:
+    """Peak resident set size of this process and of its finished children (MiB, Linux)."""
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+    }
+
+
+def run_benchmark(corpus_dir: str, n_process: int = 1, batch_size: int = 16, extractor: str = None) -> dict:
+    """Score every resume against every JD with the feature cache off and timing on.
+
+    Returns scores per JD and resume, the raw stage records, wall time,
+    throughput and peak RSS.
+    """
+    from django.test.utils import override_settings
+
+    from .ats_score import ats_score_batch, get_nlp
+    from .ats_timing import logger as timing_logger
+
+    with open(os.path.join(corpus_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    paths = [os.path.join(corpus_dir, "resumes", name) for name in manifest["resumes"]]
+
+    # Model load is a one-off per process, not per-resume cost
+    get_nlp()
+
+    collector = TimingCollector()
+    saved_handlers = timing_logger.handlers[:]
+    timing_logger.handlers = [collector]
+    scores = {}
+    started = time.perf_counter()
+    try:
+        with override_settings(ATS_TIMING=True, ATS_CACHE_DIR=None):
+            for jd_name in manifest["jds"]:
+                with open(os.path.join(corpus_dir, "jds", jd_name), encoding="utf-8") as f:
+                    jd_text = f.read()
+                results = ats_score_batch(paths, jd_text, n_process=n_process, batch_size=batch_size, extractor=extractor)
+                scores[jd_name] = dict(zip(manifest["resumes"], results))
+    finally:
+        timing_logger.handlers = saved_handlers
+    seconds = time.perf_counter() - started
+
+    scored = len(paths) * len(manifest["jds"])
+    return {
+        "scores": scores,
+        "records": collector.records,
+        "scored": scored,
+        "seconds": seconds,
+        "throughput": scored / seconds if seconds else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def stage_summary(records: list) -> dict:
+    """{stage: sorted durations in ms}."""
+    by_stage = defaultdict(list)
+    for record in records:
+        by_stage[record["stage"]].append(record["ms"])
+    return {name: sorted(ms) for name, ms in by_stage.items()}
+
+
+def compare_golden(scores: dict, golden: dict, tolerance: float = 0.0) -> list:
+    """(jd, resume, golden score, new score) for every score that moved more than `tolerance`."""
+    diffs = []
+    for jd_name, expected in golden.items():
+        for resume, old in expected.items():
+            new = scores.get(jd_name, {}).get(resume)
+            if new is None or abs(new - old) > tolerance:
+                diffs.append((jd_name, resume, old, new))
+    return diffs
@@ -0,0 +1,71 @@
+# app/duplicates.py
+
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from .minhash import DUPLICATE_THRESHOLD, band_buckets, similarity
+from .models import ApplicationBand, JobApplication
+
+
+def index_signatures(signatures: dict) -> None:
+    """Store LSH buckets for {application id: minhash} and group each with its near-duplicates.
+
+    Candidates come from applications of the same job that share a bucket,
+    so each application is compared with a handful of others instead of
+    with every applicant. Results are saved as they complete, so a later
+    application can be indexed before an earlier one; each match therefore
+    relinks the whole group to its lowest id rather than only pointing the
+    new application at an earlier one.
+    """
+    signatures = {app_id: sig for app_id, sig in signatures.items() if sig}
+    if not signatures:
+        return
+    job_ids = dict(JobApplication.objects.filter(id__in=list(signatures)).values_list("id", "job_id"))
+
+    ApplicationBand.objects.filter(application_id__in=list(signatures)).delete()
+    ApplicationBand.objects.bulk_create([
+        ApplicationBand(application_id=app_id, job_id=job_ids[app_id], band=band, bucket=bucket)
+        for app_id, sig in signatures.items()
+        for band, bucket in band_buckets(sig)
+    ])
+
+    for app_id, sig in signatures.items():
+        matches = near_duplicates(app_id, job_ids[app_id], sig)
+        if matches:
+            link_group(job_ids[app_id], {app_id, *matches})
+        else:
+            JobApplication.objects.filter(id=app_id).update(duplicate_of=None)
+
+
+def near_duplicates(app_id: int, job_id: int, signature: bytes) -> list:
+    """Ids of other applications in the job whose resume is a near-duplicate."""
+    buckets = reduce(or_, [Q(band=band, bucket=bucket) for band, bucket in band_buckets(signature)])
+    candidate_ids = (
+        ApplicationBand.objects.filter(job_id=job_id).filter(buckets)
+        .exclude(application_id=app_id)
+        .values_list("application_id", flat=True)
+        .distinct()
+    )
+    return [
+        other_id
+        for other_id, other_sig in JobApplication.objects.filter(id__in=list(candidate_ids)).values_list("id", "minhash")
+        if other_sig and similarity(signature, other_sig) >= DUPLICATE_THRESHOLD
+    ]
+
+
+def link_group(job_id: int, app_ids: set) -> None:
+    """Merge app_ids and the groups they already belong to under the lowest id.
+
+    Groups stay one level deep (every member points at the root), so they
+    never form chains or cycles.
+    """
+    applications = JobApplication.objects.filter(job_id=job_id)
+    roots = set(app_ids) | set(
+        applications.filter(id__in=list(app_ids), duplicate_of__isnull=False).values_list("duplicate_of", flat=True)
+    )
+    members = set(applications.filter(Q(id__in=list(roots)) | Q(duplicate_of__in=list(roots))).values_list("id", flat=True))
+    root = min(members)
+    applications.filter(id=root).update(duplicate_of=None)
+    applications.filter(id__in=list(members - {root})).exclude(duplicate_of=root).update(duplicate_of=root)
@@ -0,0 +1,112 @@
+# app/ingest.py
+
+import os
+import logging
+import zipfile
+
+from django.core.files import File
+
+from .models import JobApplication
+
+
+logger = logging.getLogger(__name__)
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+def get_max_file_bytes() -> int:
+    from django.conf import settings
+
+    default = 10 * 1024 * 1024
+    return getattr(settings, "ATS_INGEST_MAX_FILE_BYTES", default) if settings.configured else default
+
+
+# ---------- Sources ----------
+class IngestEntry:
+    """One resume in an archive or directory; `open()` streams its bytes."""
+
+    def __init__(self, name: str, size: int, opener):
+        self.name = name
+        self.size = size
+        self.open = opener
+
+
+def iter_entries(source):
+    """Yield an IngestEntry per file in a ZIP (path or file object) or a directory.
+
+    ZIP members are read straight from the archive one at a time; nothing is
+    extracted to a temporary directory.
+    """
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                yield IngestEntry(
+                    os.path.relpath(path, source), os.path.getsize(path),
+                    lambda path=path: open(path, "rb"),
+                )
+        return
+
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            yield IngestEntry(info.filename, info.file_size, lambda info=info: archive.open(info))
+
+
+def _skip_reason(entry: IngestEntry, max_bytes: int) -> str:
+    basename = os.path.basename(entry.name)
+    if entry.name.startswith("__MACOSX/") or basename.startswith("."):
+        return "skipped"
+    if os.path.splitext(basename)[1].lower() not in RESUME_EXTENSIONS:
+        return f"Unsupported format: {os.path.splitext(basename)[1] or basename}"
+    if entry.size > max_bytes:
+        return f"File too large ({entry.size} bytes, limit {max_bytes})"
+    return ""
+
+
+# ---------- Ingestion ----------
+def store_entries(job, entries, batch_size: int = 100, max_bytes: int = None):
+    """Copy resumes into storage and create pending JobApplications in batches.
+
+    Yields (created applications, report rows) per batch. Report rows are
+    dicts with the entry `file`, and `application` id or `error`.
+    """
+    max_bytes = max_bytes or get_max_file_bytes()
+    resume_field = JobApplication._meta.get_field("resume")
+    batch, report = [], []
+    for entry in entries:
+        reason = _skip_reason(entry, max_bytes)
+        if reason == "skipped":
+            continue
+        if reason:
+            report.append({"file": entry.name, "error": reason})
+            continue
+        try:
+            with entry.open() as f:
+                name = resume_field.storage.save(
+                    resume_field.generate_filename(None, os.path.basename(entry.name)),
+                    File(f, name=entry.name),
+                )
+        except (OSError, zipfile.BadZipFile) as exc:
+            logger.warning("Could not read %s from the upload: %s", entry.name, exc)
+            report.append({"file": entry.name, "error": f"{type(exc).__name__}: {exc}"})
+            continue
+        batch.append(JobApplication(
+            job=job,
+            resume=name,
+            source_filename=entry.name[:255],
+            scoring_status=JobApplication.SCORING_PENDING,
+        ))
+        if len(batch) >= batch_size:
+            yield _create(batch, report)
+            batch, report = [], []
+    if batch or report:
+        yield _create(batch, report)
+
+
+def _create(batch: list, report: list) -> tuple:
+    created = JobApplication.objects.bulk_create(batch)
+    report.extend({"file": joba.source_filename, "application": joba.id} for joba in created)
+    return created, report
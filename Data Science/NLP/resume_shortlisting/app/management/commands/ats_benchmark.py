@@ -0,0 +1,98 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.ats_timing import percentile
+from app.benchmark import compare_golden, generate_corpus, run_benchmark, stage_summary
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic resume corpus, or benchmark ATS scoring on one against a golden set"
+
+    def add_arguments(self, parser):
+        actions = parser.add_subparsers(dest="action", required=True)
+
+        generate = actions.add_parser("generate", help="Write synthetic PDF/DOCX/TXT resumes and JDs")
+        generate.add_argument("out", help="Corpus directory to create")
+        generate.add_argument("--resumes", type=int, default=60, help="Number of resumes")
+        generate.add_argument("--jds", type=int, default=3, help="Number of job descriptions")
+        generate.add_argument("--words", type=int, default=400, help="Approximate words per resume")
+        generate.add_argument("--formats", default="pdf,docx,txt", help="Comma-separated formats to cycle through")
+        generate.add_argument("--seed", type=int, default=0)
+
+        run = actions.add_parser("run", help="Score the corpus and report latency, throughput, RSS and drift")
+        run.add_argument("corpus", help="Directory made by 'generate'")
+        run.add_argument("--processes", type=int, default=1, help="spaCy processes for nlp.pipe")
+        run.add_argument("--batch-size", type=int, default=16)
+        run.add_argument("--extractor", choices=["nlp", "taxonomy"], help="Skill extractor (default: settings)")
+        run.add_argument("--golden", help="Golden scores JSON (default: <corpus>/golden.json)")
+        run.add_argument("--update-golden", action="store_true", help="Record this run's scores as the golden set")
+        run.add_argument("--tolerance", type=float, default=0.0, help="Allowed score drift from the golden set")
+        run.add_argument("--json", help="Also write the summary to this JSON file")
+
+    def handle(self, *args, **options):
+        if options["action"] == "generate":
+            formats = tuple(f.strip() for f in options["formats"].split(",") if f.strip())
+            unknown = set(formats) - {"pdf", "docx", "txt"}
+            if unknown:
+                raise CommandError(f"Unknown format(s): {', '.join(sorted(unknown))}")
+            manifest = generate_corpus(options["out"], options["resumes"], options["jds"], options["words"],
+                                       formats, options["seed"])
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ Wrote {len(manifest['resumes'])} resume(s) and {len(manifest['jds'])} JD(s) to {options['out']}"
+            ))
+            return
+
+        if not os.path.exists(os.path.join(options["corpus"], "manifest.json")):
+            raise CommandError(f"No manifest.json in {options['corpus']} (run 'ats_benchmark generate' first)")
+        result = run_benchmark(options["corpus"], options["processes"], options["batch_size"], options["extractor"])
+
+        header = f"{'stage':<16}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'total':>12}"
+        self.stdout.write(header + "   (ms)")
+        self.stdout.write("-" * len(header))
+        stages = stage_summary(result["records"])
+        for name, ms in sorted(stages.items()):
+            self.stdout.write(
+                f"{name:<16}{len(ms):>8}{sum(ms) / len(ms):>10.1f}"
+                f"{percentile(ms, 50):>10.1f}{percentile(ms, 90):>10.1f}"
+                f"{percentile(ms, 99):>10.1f}{sum(ms):>12.1f}"
+            )
+        rss = result["peak_rss_mb"]
+        self.stdout.write(f"\nScored {result['scored']} resume/JD pair(s) in {result['seconds']:.2f}s "
+                          f"({result['throughput']:.1f} resumes/s)")
+        self.stdout.write(f"Peak RSS: {rss['self']:.0f} MiB (children: {rss['children']:.0f} MiB)")
+
+        golden_path = options["golden"] or os.path.join(options["corpus"], "golden.json")
+        drift = None
+        if options["update_golden"]:
+            with open(golden_path, "w", encoding="utf-8") as f:
+                json.dump(result["scores"], f, indent=2, sort_keys=True)
+            self.stdout.write(f"Golden scores written to {golden_path}")
+        elif os.path.exists(golden_path):
+            with open(golden_path, encoding="utf-8") as f:
+                drift = compare_golden(result["scores"], json.load(f), options["tolerance"])
+            for jd_name, resume, old, new in drift[:20]:
+                self.stdout.write(self.style.WARNING(f"  {jd_name} / {resume}: {old} -> {new}"))
+            if drift:
+                self.stdout.write(self.style.ERROR(f"{len(drift)} score(s) drifted from {golden_path}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✅ Scores match {golden_path}"))
+        else:
+            self.stdout.write(f"No golden set at {golden_path}; record one with --update-golden")
+
+        if options["json"]:
+            summary = {
+                "stages": {name: {"count": len(ms), "p50": percentile(ms, 50), "p90": percentile(ms, 90),
+                                  "p99": percentile(ms, 99), "total": sum(ms)} for name, ms in stages.items()},
+                "scored": result["scored"],
+                "seconds": result["seconds"],
+                "throughput": result["throughput"],
+                "peak_rss_mb": rss,
+                "drift": None if drift is None else len(drift),
+            }
+            with open(options["json"], "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+
+        if drift:
+            raise CommandError("Score stability check failed")
@@ -0,0 +1,51 @@
+import os
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.ats_timing import percentile, read_records
+
+
+class Command(BaseCommand):
+    help = "Summarise ATS pipeline stage timings (p50/p90/p99) from the timing log"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", default=str(settings.ATS_TIMING_LOG),
+                            help="Timing log to read (default: settings.ATS_TIMING_LOG)")
+        parser.add_argument("--stage", help="Only report this stage")
+        parser.add_argument("--slowest", type=int, default=5,
+                            help="List the N slowest records per stage with their sizes")
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options["log"]):
+            raise CommandError(f"No timing log at {options['log']} (run with ATS_TIMING=1 first)")
+
+        by_stage = defaultdict(list)
+        for record in read_records(options["log"]):
+            if options["stage"] and record["stage"] != options["stage"]:
+                continue
+            by_stage[record["stage"]].append(record)
+
+        if not by_stage:
+            self.stdout.write("No timing records found")
+            return
+
+        header = f"{'stage':<16}{'count':>8}{'mean':>10}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}"
+        self.stdout.write(header + "   (ms)")
+        self.stdout.write("-" * len(header))
+        for name, records in sorted(by_stage.items()):
+            ms = sorted(r["ms"] for r in records)
+            self.stdout.write(
+                f"{name:<16}{len(ms):>8}{sum(ms) / len(ms):>10.1f}"
+                f"{percentile(ms, 50):>10.1f}{percentile(ms, 90):>10.1f}"
+                f"{percentile(ms, 99):>10.1f}{ms[-1]:>10.1f}"
+            )
+
+        if options["slowest"]:
+            skip = {"ts", "stage", "ms", "pid"}
+            for name, records in sorted(by_stage.items()):
+                self.stdout.write(f"\nSlowest {name}:")
+                for r in sorted(records, key=lambda r: r["ms"], reverse=True)[:options["slowest"]]:
+                    sizes = ", ".join(f"{k}={v}" for k, v in r.items() if k not in skip)
+                    self.stdout.write(f"  {r['ms']:>10.1f} ms  {sizes}")
@@ -0,0 +1,69 @@
+import csv
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.ingest import iter_entries, store_entries
+from app.models import JobApplication, JobPost
+from app.scoring import bulk_save_results, claim_pending, iter_scores, make_executor
+
+
+class Command(BaseCommand):
+    help = "Import a ZIP or directory of PDF/DOCX/TXT resumes as applications to a job and score them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("job", type=int, help="JobPost id")
+        parser.add_argument("source", help="ZIP archive or directory of resumes")
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                            help="Number of scoring processes (default: CPU count)")
+        parser.add_argument("--batch-size", type=int, default=100,
+                            help="Applications created, scored and written per batch")
+        parser.add_argument("--no-score", action="store_true",
+                            help="Only create pending applications and leave scoring to score_worker")
+        parser.add_argument("--report", help="Write a per-file CSV report to this path")
+
+    def handle(self, *args, **options):
+        try:
+            job = JobPost.objects.get(id=options["job"])
+        except JobPost.DoesNotExist:
+            raise CommandError(f"JobPost {options['job']} does not exist")
+        if not os.path.exists(options["source"]):
+            raise CommandError(f"{options['source']} does not exist")
+
+        executor = None if options["no_score"] else make_executor(options["processes"])
+        started = time.monotonic()
+        report = []
+        try:
+            for created, rows in store_entries(job, iter_entries(options["source"]), options["batch_size"]):
+                by_id = {row["application"]: row for row in rows if "application" in row}
+                if executor is not None and created:
+                    # Claimed like any worker batch, so a running score_worker won't score them twice
+                    claimed = claim_pending(len(created), JobApplication.objects.filter(id__in=list(by_id)))
+                    results = list(iter_scores(claimed, executor))
+                    bulk_save_results(results)
+                    for app_id, score, _, error in results:
+                        by_id[app_id].update(score=score, error=error)
+                report.extend(rows)
+                self.stdout.write(f"{len(report)} file(s) processed ({time.monotonic() - started:.1f}s)")
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING(
+                "Interrupted; applications left 'running' are picked up by score_worker after ATS_CLAIM_TIMEOUT"
+            ))
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        failed = [row for row in report if row.get("error")]
+        for row in failed:
+            self.stdout.write(self.style.ERROR(f"  {row['file']}: {row['error']}"))
+        if options["report"]:
+            with open(options["report"], "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=["file", "application", "score", "error"])
+                writer.writeheader()
+                writer.writerows(report)
+            self.stdout.write(f"Report written to {options['report']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Processed {len(report)} file(s), {len(failed)} with errors, in {time.monotonic() - started:.1f}s"
+        ))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import JobPost
+from app.ranking import rank_applicants
+
+
+class Command(BaseCommand):
+    help = "Rank a job's applicants by TF-IDF similarity to the job description"
+
+    def add_arguments(self, parser):
+        parser.add_argument("job", type=int, help="JobPost id")
+        parser.add_argument("--top", type=int, default=10, help="Number of applicants to list (0 for all)")
+        parser.add_argument("--processes", type=int, default=1,
+                            help="spaCy processes for resumes missing from the feature cache")
+
+    def handle(self, *args, **options):
+        try:
+            job = JobPost.objects.get(id=options["job"])
+        except JobPost.DoesNotExist:
+            raise CommandError(f"JobPost {options['job']} does not exist")
+
+        started = time.monotonic()
+        info = {}
+        ranked = rank_applicants(job, options["top"] or None, options["processes"], load_missing=True, info=info)
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(f"{'#':>4}  {'score':>6}  {'tfidf':>6}  {'ats':>6}  applicant")
+        for n, r in enumerate(ranked, 1):
+            joba = r.application
+            self.stdout.write(
+                f"{n:>4}  {r.score:>6.1f}  {r.similarity:>6.3f}  {joba.ats_score:>6.1f}  "
+                f"{joba.applicant_name} (application {joba.id})"
+            )
+        if info["omitted"]:
+            self.stdout.write(self.style.WARNING(
+                f"{info['omitted']} applicant(s) whose resume could not be loaded were queued for rescoring"
+            ))
+        self.stdout.write(self.style.SUCCESS(f"✅ Ranked {len(ranked)} applicant(s) in {elapsed:.2f}s"))
@@ -0,0 +1,84 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import JobApplication, JobPost
+from app.scoring import (
+    bulk_save_results, claim_pending, enqueue, get_claim_timeout, iter_scores, make_executor, release, requeue_running,
+)
+
+
+class Command(BaseCommand):
+    help = "Recompute ATS scores for existing applications of a job, a company, or all jobs"
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--job", type=int, help="JobPost id")
+        target.add_argument("--company", help="Username of the company account that posted the jobs")
+        target.add_argument("--all", action="store_true", help="Every application")
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                            help="Number of scoring processes (default: CPU count)")
+        parser.add_argument("--chunk-size", type=int, default=100,
+                            help="Applications scored and written per bulk_update")
+        parser.add_argument("--resume", action="store_true",
+                            help="Continue an interrupted run instead of re-queueing every application")
+
+    def handle(self, *args, **options):
+        if options["job"] is not None:
+            jobs = JobPost.objects.filter(id=options["job"])
+            if not jobs.exists():
+                raise CommandError(f"JobPost {options['job']} does not exist")
+        elif options["company"]:
+            jobs = JobPost.objects.filter(user__username=options["company"])
+            if not jobs.exists():
+                raise CommandError(f"No jobs posted by '{options['company']}'")
+        else:
+            jobs = JobPost.objects.all()
+        applications = JobApplication.objects.filter(job__in=jobs)
+
+        if options["resume"]:
+            # Rows a killed run claimed were never written back; fresh claims may belong to a live worker
+            requeue_running(applications, older_than=get_claim_timeout())
+        else:
+            enqueue(applications)
+
+        total = applications.filter(scoring_status=JobApplication.SCORING_PENDING).count()
+        self.stdout.write(f"Rescoring {total} application(s) with {options['processes']} process(es)")
+
+        executor = make_executor(options["processes"])
+        started = time.monotonic()
+        done = 0
+        refreshed = set()
+        chunk = []
+        try:
+            while True:
+                chunk = claim_pending(options["chunk_size"], applications)
+                if not chunk:
+                    break
+                # Re-parse each description once, and only for jobs that have rows to score;
+                # the chunk's rows share one instance per job so they all see the refreshed features
+                chunk_jobs = {}
+                for joba in chunk:
+                    joba.job = chunk_jobs.setdefault(joba.job_id, joba.job)
+                for job in chunk_jobs.values():
+                    if job.id not in refreshed:
+                        job.refresh_jd_features()
+                        job.save(update_fields=["jd_keywords", "jd_years", "jd_education", "jd_skills"])
+                        refreshed.add(job.id)
+                done += bulk_save_results(iter_scores(chunk, executor))
+                chunk = []
+                elapsed = time.monotonic() - started
+                rate = done / elapsed if elapsed else 0.0
+                eta = (total - done) / rate if rate else 0.0
+                self.stdout.write(f"{done}/{total} rescored ({rate:.1f}/s, ~{eta:.0f}s left)")
+        except KeyboardInterrupt:
+            release(chunk)
+            self.stdout.write(self.style.WARNING(
+                f"Interrupted after {done}/{total}; run again with --resume to continue"
+            ))
+            return
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Rescored {done} application(s)"))
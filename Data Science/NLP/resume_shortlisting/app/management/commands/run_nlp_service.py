@@ -0,0 +1,29 @@
+import os
+import socket
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.nlp_service import make_server
+
+
+class Command(BaseCommand):
+    help = "Serve spaCy parsing for all Django workers from one process holding the model"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--address", default=settings.ATS_NLP_SERVICE or "unix:/tmp/ats_nlp.sock",
+                            help="'unix:/path/to.sock' or 'host:port' (default: settings.ATS_NLP_SERVICE)")
+        parser.add_argument("--batch-size", type=int, default=16,
+                            help="nlp.pipe batch size for resume parsing")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Loading NLP model and listening on {options['address']}")
+        server = make_server(options["address"], options["batch_size"])
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping NLP service")
+        finally:
+            server.server_close()
+            if server.address_family == socket.AF_UNIX:
+                os.remove(server.server_address)
@@ -0,0 +1,57 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.scoring import (
+    claim_jd_rescores, claim_pending, make_executor, release, requeue_running, rescore_from_cache, score_applications,
+)
+
+
+class Command(BaseCommand):
+    help = "Process pending JobApplication ATS scores in a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                            help="Number of scoring processes (default: CPU count)")
+        parser.add_argument("--batch-size", type=int, default=20,
+                            help="Applications claimed per poll")
+        parser.add_argument("--poll-interval", type=float, default=2.0,
+                            help="Seconds to sleep when the queue is empty")
+        parser.add_argument("--once", action="store_true",
+                            help="Drain the queue and exit instead of polling forever")
+        parser.add_argument("--requeue-running", action="store_true",
+                            help="Reset every application in 'running' before starting, without waiting for "
+                                 "ATS_CLAIM_TIMEOUT (only when no other worker is running)")
+
+    def handle(self, *args, **options):
+        if options["requeue_running"]:
+            count = requeue_running()
+            self.stdout.write(f"Requeued {count} application(s)")
+
+        executor = make_executor(options["processes"])
+        self.stdout.write(f"Scoring worker started with {options['processes']} process(es)")
+        batch = []
+        try:
+            while True:
+                # Edited job descriptions first: cheap, and stale scores are visible to companies
+                for job in claim_jd_rescores():
+                    rescored, queued = rescore_from_cache(job)
+                    self.stdout.write(f"Rescored {rescored} application(s) of job {job.id} for its new description"
+                                      + (f", {queued} queued for full scoring" if queued else ""))
+                batch = claim_pending(options["batch_size"])
+                if not batch:
+                    if options["once"]:
+                        self.stdout.write(self.style.SUCCESS("✅ Scoring queue drained"))
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+                done = score_applications(batch, executor)
+                batch = []
+                self.stdout.write(f"Scored {done} application(s)")
+        except KeyboardInterrupt:
+            # Whatever of the batch wasn't written yet goes back to the queue for the next worker
+            release(batch)
+            self.stdout.write("Stopping scoring worker")
+        finally:
+            executor.shutdown(cancel_futures=True)
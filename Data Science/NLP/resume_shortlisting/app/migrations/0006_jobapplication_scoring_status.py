@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:51
+
+from django.db import migrations, models
+
+
+def mark_existing_scored(apps, schema_editor):
+    # Applications created before the queue existed were scored inline.
+    JobApplication = apps.get_model('app', 'JobApplication')
+    JobApplication.objects.update(scoring_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_alter_jobapplication_job_seeker'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='scored_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='scoring_error',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='scoring_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_scored, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_jobapplication_scoring_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='jd_education',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='jd_keywords',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='jd_years',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations
+
+
+# The SQL is frozen here rather than imported from app.search, so this
+# migration keeps installing exactly what it always did.
+FTS_SQL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS app_jobpost_fts USING fts5(
+        job_title, company, description,
+        content='app_jobpost', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS app_jobpost_fts_ai AFTER INSERT ON app_jobpost BEGIN
+        INSERT INTO app_jobpost_fts(rowid, job_title, company, description)
+        VALUES (new.id, new.job_title, new.company, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS app_jobpost_fts_ad AFTER DELETE ON app_jobpost BEGIN
+        INSERT INTO app_jobpost_fts(app_jobpost_fts, rowid, job_title, company, description)
+        VALUES ('delete', old.id, old.job_title, old.company, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS app_jobpost_fts_au AFTER UPDATE OF job_title, company, description ON app_jobpost BEGIN
+        INSERT INTO app_jobpost_fts(app_jobpost_fts, rowid, job_title, company, description)
+        VALUES ('delete', old.id, old.job_title, old.company, old.description);
+        INSERT INTO app_jobpost_fts(rowid, job_title, company, description)
+        VALUES (new.id, new.job_title, new.company, new.description);
+    END""",
+    "INSERT INTO app_jobpost_fts(app_jobpost_fts) VALUES ('rebuild')",
+]
+
+DROP_FTS_SQL = [
+    "DROP TRIGGER IF EXISTS app_jobpost_fts_ai",
+    "DROP TRIGGER IF EXISTS app_jobpost_fts_ad",
+    "DROP TRIGGER IF EXISTS app_jobpost_fts_au",
+    "DROP TABLE IF EXISTS app_jobpost_fts",
+]
+
+
+class SQLiteRunSQL(migrations.RunSQL):
+    """RunSQL that is a no-op on other databases (FTS5 is SQLite-only; search.py falls back to icontains)."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "sqlite":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "sqlite":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_jobpost_jd_features'),
+    ]
+
+    operations = [
+        SQLiteRunSQL(FTS_SQL, DROP_FTS_SQL),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:04
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_jobpost_jd_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicationSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='education_tier',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='experience_years',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', '-ats_score'], name='jobapp_job_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', 'experience_years'], name='jobapp_job_years_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job', 'education_tier'], name='jobapp_job_edu_idx'),
+        ),
+        migrations.AddField(
+            model_name='applicationskill',
+            name='application',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skills', to='app.jobapplication'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationskill',
+            index=models.Index(fields=['skill'], name='appskill_skill_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='applicationskill',
+            constraint=models.UniqueConstraint(fields=('application', 'skill'), name='appskill_app_skill_uniq'),
+        ),
+    ]
@@ -0,0 +1,167 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The taxonomy as of this migration, frozen here so the backfill doesn't
+# change when app.skills does.
+SKILL_TAXONOMY = {
+    # Languages
+    "python": ["python3", "python 3"],
+    "java": ["java 8", "java 11", "java 17"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": [],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "golang": ["go lang"],
+    "rust": [],
+    "kotlin": [],
+    "swift": [],
+    "php": [],
+    "ruby": [],
+    "scala": [],
+    "r programming": ["rstudio"],
+    "matlab": [],
+    "dart": [],
+    "bash": ["shell scripting", "shell script"],
+    "sql": ["t-sql", "pl/sql", "plsql"],
+    "html": ["html5"],
+    "css": ["css3"],
+    # Web frameworks
+    "django": ["django rest framework", "drf"],
+    "flask": [],
+    "fastapi": [],
+    "spring boot": ["spring framework", "spring mvc"],
+    "node.js": ["nodejs", "node js"],
+    "express.js": ["expressjs"],
+    "react": ["react.js", "reactjs", "react js"],
+    "angular": ["angularjs", "angular.js"],
+    "vue.js": ["vue", "vuejs"],
+    "next.js": ["nextjs"],
+    ".net": ["dotnet", "asp.net", ".net core"],
+    "laravel": [],
+    "ruby on rails": ["rails"],
+    "bootstrap": [],
+    "tailwind css": ["tailwind", "tailwindcss"],
+    "jquery": [],
+    "flutter": [],
+    "react native": [],
+    "android": ["android development"],
+    "ios": ["ios development"],
+    # Data & ML
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "artificial intelligence": ["ai"],
+    "natural language processing": ["nlp"],
+    "computer vision": ["opencv"],
+    "data science": [],
+    "data analysis": ["data analytics", "data analyst"],
+    "data visualization": ["data visualisation"],
+    "statistics": ["statistical analysis"],
+    "pandas": [],
+    "numpy": [],
+    "scipy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "tensorflow": ["keras"],
+    "pytorch": ["torch"],
+    "spacy": [],
+    "nltk": [],
+    "hugging face": ["huggingface", "transformers"],
+    "power bi": ["powerbi"],
+    "tableau": [],
+    "microsoft excel": ["ms excel", "advanced excel", "excel spreadsheets"],
+    "spark": ["apache spark", "pyspark"],
+    "hadoop": [],
+    "airflow": ["apache airflow"],
+    "etl": [],
+    "big data": [],
+    # Databases
+    "mysql": [],
+    "postgresql": ["postgres"],
+    "sqlite": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "oracle": ["oracle db"],
+    "sql server": ["mssql", "ms sql"],
+    "elasticsearch": ["elastic search"],
+    "firebase": [],
+    # Cloud & DevOps
+    "aws": ["amazon web services", "aws lambda", "ec2"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "docker": ["dockerfile", "containerization"],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ansible": [],
+    "jenkins": [],
+    "ci/cd": ["ci cd", "continuous integration", "continuous deployment"],
+    "git": ["github", "gitlab", "bitbucket"],
+    "linux": ["unix", "ubuntu"],
+    "nginx": [],
+    "microservices": ["microservice"],
+    "rest api": ["restful", "rest apis", "restful api", "api development"],
+    "graphql": [],
+    # Practice & tooling
+    "agile": ["scrum", "kanban"],
+    "jira": [],
+    "unit testing": ["pytest", "junit", "unittest"],
+    "selenium": [],
+    "figma": [],
+    "ui/ux": ["ui ux", "ux design", "ui design", "user experience"],
+    "photoshop": ["adobe photoshop"],
+    "seo": ["search engine optimization"],
+    "digital marketing": [],
+    "project management": ["pmp"],
+    "cybersecurity": ["cyber security", "information security"],
+    "networking": ["computer networks", "tcp/ip"],
+}
+
+
+def find_skills(nlp, matcher, canonical, text):
+    return {canonical[match_id] for match_id, _, _ in matcher(nlp.make_doc(text))}
+
+
+def build_keyword_index(apps, schema_editor):
+    # Historical models don't run JobPost.save(), so index existing jobs here.
+    import spacy
+    from spacy.matcher import PhraseMatcher
+
+    nlp = spacy.blank("en")
+    matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+    canonical = {}
+    for skill, aliases in SKILL_TAXONOMY.items():
+        key = f"skill:{skill}"
+        canonical[nlp.vocab.strings.add(key)] = skill
+        matcher.add(key, list(nlp.tokenizer.pipe({skill, *aliases})))
+
+    JobPost = apps.get_model('app', 'JobPost')
+    JobKeyword = apps.get_model('app', 'JobKeyword')
+    for job in JobPost.objects.iterator():
+        if job.jd_skills is None:
+            job.jd_skills = sorted(find_skills(nlp, matcher, canonical, job.description))
+            job.save(update_fields=['jd_skills'])
+        if job.is_active:
+            JobKeyword.objects.bulk_create([JobKeyword(job_id=job.id, keyword=k) for k in job.jd_skills])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_jobapplication_resume_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('keyword', models.CharField(max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='index_keywords', to='app.jobpost')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('keyword', 'job'), name='jobkeyword_keyword_job_uniq')],
+            },
+        ),
+        migrations.RunPython(build_keyword_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0017_jobapplication_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='jd_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
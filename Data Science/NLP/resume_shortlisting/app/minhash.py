@@ -0,0 +1,70 @@
+# app/minhash.py
+
+import re
+import zlib
+import hashlib
+
+import numpy as np
+
+from .ats_timing import stage
+
+
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard almost always share a band
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+# Estimated Jaccard similarity at which two resumes count as the same document
+DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed: signatures are stored, so every process must use the same permutations
+_rng = np.random.RandomState(1)
+_A = _rng.randint(1, 1 << 32, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 1 << 32, size=NUM_PERM).astype(np.uint64)
+
+WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str) -> np.ndarray:
+    """crc32 of every run of SHINGLE_SIZE words (or of the words, for very short texts)."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) >= SHINGLE_SIZE:
+        grams = (" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    else:
+        grams = iter(words)
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64))
+
+
+def minhash_signature(text: str):
+    """NUM_PERM uint32 minimums packed as bytes, or None for text without words."""
+    with stage("minhash", chars=len(text)) as info:
+        hashes = shingles(text)
+        info["shingles"] = len(hashes)
+        if not len(hashes):
+            return None
+        # One row per shingle, one column per permutation; uint64 overflow is part of the hash
+        permuted = (np.outer(hashes, _A) + _B) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32).tobytes()
+
+
+def signature_array(signature: bytes) -> np.ndarray:
+    return np.frombuffer(bytes(signature), dtype=np.uint32)
+
+
+def similarity(a: bytes, b: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures' shingle sets."""
+    return float(np.mean(signature_array(a) == signature_array(b)))
+
+
+def band_buckets(signature: bytes) -> list:
+    """(band, bucket) pairs; near-duplicates share at least one with high probability."""
+    sig = signature_array(signature)
+    return [
+        (band, int.from_bytes(
+            hashlib.blake2b(sig[band * ROWS:(band + 1) * ROWS].tobytes(), digest_size=8).digest(),
+            "big", signed=True,
+        ))
+        for band in range(BANDS)
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+# The NLP stack (ats_score, skills) is imported inside the methods that parse,
+# so processes that only use the ORM (migrations, web workers) never load spaCy
+
 # Create your models here.
 
 class JobPost(models.Model):
@@ -15,6 +18,75 @@ class JobPost(models.Model):
     salary = models.CharField(max_length=200)
     is_active = models.BooleanField(default=True)
     posted_at = models.DateTimeField(auto_now_add=True)
+    # Derived from description by refresh_jd_features(); null until computed
+    jd_keywords = models.JSONField(blank=True, null=True)
+    jd_years = models.IntegerField(default=0)
+    jd_education = models.CharField(max_length=20, blank=True, default='')
+    jd_skills = models.JSONField(blank=True, null=True)
+    # Set when the description changes; score_worker then rescores applications from cached features
+    rescore_requested_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    # When the description last changed; results claimed before it were computed against the old JD
+    jd_updated_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of active listings on (posted_at, id)
+            models.Index(fields=['is_active', '-posted_at', '-id'], name='jobpost_active_posted_idx'),
+            # Conditional counts on the company dashboard
+            models.Index(fields=['user', 'is_active', 'last_date'], name='jobpost_user_active_date_idx'),
+        ]
+
+    def refresh_jd_features(self):
+        """Recompute the stored ATS inputs from the description (call before save())."""
+        from .ats_score import parse_jd
+
+        jd = parse_jd(self.description)
+        self.jd_keywords = sorted(jd.keywords)
+        self.jd_years = jd.experience_years
+        self.jd_education = jd.education_tier
+        self.jd_skills = sorted(jd.skills)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or {'jd_skills', 'is_active'} & set(update_fields):
+            self.sync_keyword_index()
+
+    def sync_keyword_index(self):
+        """Bring this job's JobKeyword rows in line with jd_skills, touching only the difference.
+
+        Only active jobs are indexed, so recommendation lookups never join JobPost.
+        """
+        current = set(self.index_keywords.values_list('keyword', flat=True))
+        wanted = set(self.jd_skills or []) if self.is_active else set()
+        if current - wanted:
+            self.index_keywords.filter(keyword__in=current - wanted).delete()
+        JobKeyword.objects.bulk_create([JobKeyword(job=self, keyword=k) for k in wanted - current])
+
+    def parsed_jd(self) -> "ParsedJD":
+        from .ats_score import ParsedJD
+        from .skills import get_skill_matcher
+
+        if self.jd_keywords is None:
+            self.refresh_jd_features()
+        # Jobs saved before jd_skills existed: the taxonomy pass is cheap, so don't re-parse
+        skills = set(self.jd_skills) if self.jd_skills is not None else get_skill_matcher().find(self.description)
+        return ParsedJD(set(self.jd_keywords), self.jd_years, self.jd_education, skills)
+
+
+class JobKeyword(models.Model):
+    """Inverted index entry for recommendations: a JD skill -> an active job that asks for it."""
+    job = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name='index_keywords')
+    keyword = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            # keyword first: recommendation lookups read (keyword -> job ids) from this index alone
+            models.UniqueConstraint(fields=['keyword', 'job'], name='jobkeyword_keyword_job_uniq'),
+        ]
+
+    def __str__(self):
+        return self.keyword
 
 
 class CompanyProfile(models.Model):
@@ -33,9 +105,80 @@ class JobSeekerProfile(models.Model):
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
 
 class JobApplication(models.Model):
+    SCORING_PENDING = 'pending'
+    SCORING_RUNNING = 'running'
+    SCORING_DONE = 'done'
+    SCORING_FAILED = 'failed'
+    SCORING_STATUS_CHOICES = [
+        (SCORING_PENDING, 'Pending'),
+        (SCORING_RUNNING, 'Running'),
+        (SCORING_DONE, 'Done'),
+        (SCORING_FAILED, 'Failed'),
+    ]
+
     job = models.ForeignKey(JobPost, on_delete=models.CASCADE)
-    job_seeker = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Empty for resumes a company imported in bulk (see ingest.py); source_filename names those
+    job_seeker = models.ForeignKey(User, on_delete=models.CASCADE, blank=True, null=True)
+    source_filename = models.CharField(max_length=255, blank=True, default='')
     applied_at = models.DateTimeField(auto_now_add=True)
     resume = models.FileField(upload_to='resumes/', blank=True, null=True)
     ats_score = models.FloatField(default=0.0)
+    # ATS scoring runs in the score_worker command, not in the request
+    scoring_status = models.CharField(max_length=20, choices=SCORING_STATUS_CHOICES, default=SCORING_PENDING, db_index=True)
+    scored_at = models.DateTimeField(blank=True, null=True)
+    # When a worker set 'running'; claims older than settings.ATS_CLAIM_TIMEOUT are taken over
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    scoring_error = models.TextField(blank=True, default='')
+    # Resume features stored at scoring time so companies can filter in SQL; null until scored
+    experience_years = models.PositiveIntegerField(blank=True, null=True)
+    education_tier = models.CharField(max_length=20, blank=True, default='')
+    # MinHash of the resume text (see minhash.py) and the earliest near-duplicate in the same job
+    minhash = models.BinaryField(blank=True, null=True)
+    resume_digest = models.CharField(max_length=64, blank=True, default='')
+    duplicate_of = models.ForeignKey('self', on_delete=models.SET_NULL, blank=True, null=True, related_name='duplicates')
+
+    class Meta:
+        indexes = [
+            # "Has this seeker applied to this job?" anti-join in jobseeker_dashboard
+            models.Index(fields=['job_seeker', 'job'], name='jobapp_seeker_job_idx'),
+            # Applicant filters and sorts in job_applicants
+            models.Index(fields=['job', '-ats_score'], name='jobapp_job_score_idx'),
+            models.Index(fields=['job', 'experience_years'], name='jobapp_job_years_idx'),
+            models.Index(fields=['job', 'education_tier'], name='jobapp_job_edu_idx'),
+        ]
+
+    @property
+    def applicant_name(self):
+        return self.job_seeker.username if self.job_seeker_id else self.source_filename
+
+
+class ApplicationBand(models.Model):
+    """One LSH band bucket of an application's MinHash; shared buckets mark duplicate candidates."""
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='bands')
+    job = models.ForeignKey(JobPost, on_delete=models.CASCADE)
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'band', 'bucket'], name='appband_job_bucket_idx'),
+        ]
+
+
+class ApplicationSkill(models.Model):
+    """One taxonomy skill found in an application's resume (see skills.py)."""
+    application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='skills')
+    skill = models.CharField(max_length=100)
+
+    class Meta:
+        constraints = [
+            # Also the index behind "applicant has skill X" lookups
+            models.UniqueConstraint(fields=['application', 'skill'], name='appskill_app_skill_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['skill'], name='appskill_skill_idx'),
+        ]
+
+    def __str__(self):
+        return self.skill
 
@@ -0,0 +1,204 @@
+# app/nlp_service.py
+
+import os
+import json
+import queue
+import socket
+import logging
+import threading
+import socketserver
+from concurrent.futures import Future
+
+
+logger = logging.getLogger(__name__)
+
+
+class NLPServiceError(Exception):
+    """The service was unreachable, timed out, or reported a failure."""
+
+
+def parse_address(address: str):
+    """'unix:/path/to.sock' or 'host:port' -> (socket family, address)."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+# ---------- Server ----------
+class NLPRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line in, one JSON response per line out."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                response = {"ok": True}
+                response.update(self.server.dispatch(request))
+            except Exception as exc:
+                logger.exception("NLP service request failed")
+                response = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class NLPBatcher:
+    """Runs every spaCy call on one thread, merging requests that queue up meanwhile.
+
+    spaCy pipelines are not safe to call from several threads at once, so
+    handler threads only queue texts. While one batch is in nlp.pipe, new
+    requests wait; the next batch takes all of them (up to `max_docs` texts),
+    so concurrent clients share pipe calls instead of taking turns.
+    """
+
+    def __init__(self, batch_size: int = 16, max_docs: int = 256):
+        self.batch_size = batch_size
+        self.max_docs = max_docs
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="nlp-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, op: str, texts: list) -> Future:
+        """Queue texts for `op`; the Future resolves to one result per text."""
+        future = Future()
+        self._queue.put((op, list(texts), future))
+        return future
+
+    def _collect(self) -> list:
+        requests = [self._queue.get()]
+        docs = len(requests[0][1])
+        while docs < self.max_docs:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            requests.append(request)
+            docs += len(request[1])
+        return requests
+
+    def _run(self):
+        while True:
+            requests = self._collect()
+            for op in dict.fromkeys(op for op, _, _ in requests):
+                self._run_op(op, [r for r in requests if r[0] == op])
+
+    def _run_op(self, op: str, requests: list):
+        texts = [text for _, request_texts, _ in requests for text in request_texts]
+        try:
+            results = self._process(op, texts)
+        except Exception as exc:
+            if len(requests) > 1:
+                # Don't fail every client for one bad request: retry them one by one
+                for request in requests:
+                    self._run_op(op, [request])
+                return
+            requests[0][2].set_exception(exc)
+            return
+        start = 0
+        for _, request_texts, future in requests:
+            future.set_result(results[start:start + len(request_texts)])
+            start += len(request_texts)
+
+    def _process(self, op: str, texts: list) -> list:
+        from .ats_score import _extract_jd_keywords_batch, _parse_resumes_local
+
+        if op == "parse_resumes":
+            return [r.to_dict() for r in _parse_resumes_local(texts, batch_size=self.batch_size)]
+        if op == "jd_keywords":
+            return [sorted(k) for k in _extract_jd_keywords_batch(texts, batch_size=self.batch_size)]
+        raise ValueError(f"Unknown op: {op}")
+
+
+class _ServiceMixin:
+    daemon_threads = True
+    allow_reuse_address = True
+    # Every worker process may connect at once; the default backlog of 5
+    # makes Unix-socket clients fail with EAGAIN
+    request_queue_size = 128
+
+    def setup_service(self, batch_size: int):
+        from .ats_score import get_nlp
+
+        get_nlp()
+        self.batcher = NLPBatcher(batch_size)
+
+    def dispatch(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "ping":
+            return {}
+        if op == "parse_resumes":
+            return {"resumes": self.batcher.submit(op, request["texts"]).result()}
+        if op == "jd_keywords":
+            return {"keywords": self.batcher.submit(op, [request["text"]]).result()[0]}
+        raise ValueError(f"Unknown op: {op}")
+
+
+class UnixNLPServer(_ServiceMixin, socketserver.ThreadingUnixStreamServer):
+    pass
+
+
+class TCPNLPServer(_ServiceMixin, socketserver.ThreadingTCPServer):
+    pass
+
+
+def make_server(address: str, batch_size: int = 16):
+    """Load the model once and bind a server that shares it with every client."""
+    family, addr = parse_address(address)
+    if family == socket.AF_UNIX and os.path.exists(addr):
+        # Left behind by a previous run that didn't shut down cleanly
+        os.remove(addr)
+    server_class = UnixNLPServer if family == socket.AF_UNIX else TCPNLPServer
+    server = server_class(addr, NLPRequestHandler)
+    server.setup_service(batch_size)
+    return server
+
+
+# ---------- Client ----------
+class NLPServiceClient:
+    """Sends one request per connection.
+
+    With `fallback` (the default), callers in ats_score parse in-process
+    when the service fails; otherwise the NLPServiceError propagates.
+    """
+
+    def __init__(self, address: str, timeout: float = 120.0, fallback: bool = True):
+        self.address = address
+        self.timeout = timeout
+        self.fallback = fallback
+
+    def call(self, op: str, **payload) -> dict:
+        family, addr = parse_address(self.address)
+        payload["op"] = op
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(addr)
+                sock.sendall((json.dumps(payload) + "\n").encode("utf-8"))
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except socket.timeout:
+            raise NLPServiceError(f"No response from {self.address} within {self.timeout:g}s") from None
+        except OSError as exc:
+            raise NLPServiceError(f"Cannot reach {self.address}: {exc}") from exc
+        if not line:
+            raise NLPServiceError("Connection closed without a response")
+        try:
+            response = json.loads(line)
+        except ValueError as exc:
+            raise NLPServiceError(f"Malformed response: {exc}") from exc
+        if not response.get("ok"):
+            raise NLPServiceError(response.get("error", "Unknown error"))
+        return response
+
+
+def get_service_client():
+    """A client for settings.ATS_NLP_SERVICE, or None to parse in-process."""
+    from django.conf import settings
+
+    if not settings.configured or not getattr(settings, "ATS_NLP_SERVICE", None):
+        return None
+    return NLPServiceClient(
+        settings.ATS_NLP_SERVICE,
+        getattr(settings, "ATS_NLP_SERVICE_TIMEOUT", 120.0),
+        getattr(settings, "ATS_NLP_SERVICE_FALLBACK", True),
+    )
@@ -0,0 +1,136 @@
+# app/pagination.py
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class KeysetPage:
+    """One page of a KeysetPaginator; iterable like django.core.paginator.Page."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Cursor pagination over a queryset ordered by `ordering`.
+
+    Each page seeks past the last row of the previous one with a WHERE clause
+    on the ordering columns instead of OFFSET, and never runs a COUNT, so
+    page 500 costs the same as page 1. The ordering must end in a unique
+    column (e.g. "-id") so every row has a distinct position.
+    """
+
+    def __init__(self, queryset, per_page: int, ordering=("-posted_at", "-id")):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.ordering = list(ordering)
+
+    def get_page(self, after=None, before=None) -> KeysetPage:
+        after, before = self._decode(after), self._decode(before)
+        if before is not None:
+            rows = list(
+                self.queryset.filter(self._seek(before, backwards=True))
+                .order_by(*self._reversed_ordering())[:self.per_page + 1]
+            )
+            more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            return KeysetPage(
+                rows,
+                next_cursor=self._cursor(rows[-1]) if rows else None,
+                previous_cursor=self._cursor(rows[0]) if rows and more else None,
+            )
+
+        queryset = self.queryset.order_by(*self.ordering)
+        if after is not None:
+            queryset = queryset.filter(self._seek(after))
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(rows[-1]) if rows and more else None,
+            previous_cursor=self._cursor(rows[0]) if rows and after is not None else None,
+        )
+
+    # ---------- Helpers ----------
+    def _fields(self):
+        return [(f.lstrip("-"), f.startswith("-")) for f in self.ordering]
+
+    def _model_field(self, name):
+        # Annotations (e.g. search_rank) carry their own output field
+        annotation = self.queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        return self.queryset.model._meta.get_field(name)
+
+    def _reversed_ordering(self):
+        return [f[1:] if f.startswith("-") else f"-{f}" for f in self.ordering]
+
+    def _seek(self, values, backwards=False) -> Q:
+        """Rows strictly after `values` in the ordering (before them if backwards)."""
+        fields = self._fields()
+        if len(values) != len(fields):
+            raise ValueError("Cursor does not match ordering")
+
+        def op(descending, strict=True):
+            forward_lt = descending != backwards
+            return ("lt" if forward_lt else "gt") + ("" if strict else "e")
+
+        seek = Q()
+        for i, (name, descending) in enumerate(fields):
+            term = Q(**{n: v for (n, _), v in zip(fields[:i], values[:i])})
+            term &= Q(**{f"{name}__{op(descending)}": values[i]})
+            seek |= term
+        # The non-strict bound on the leading column lets the index do the range scan
+        name, descending = fields[0]
+        return Q(**{f"{name}__{op(descending, strict=False)}": values[0]}) & seek
+
+    def _cursor(self, obj) -> str:
+        values = []
+        for name, _ in self._fields():
+            value = getattr(obj, name)
+            if isinstance(value, (datetime.date, datetime.datetime)):
+                value = value.isoformat()
+            values.append(value)
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def _decode(self, cursor):
+        """Cursor values typed for the ordering columns; None (the first page) if it doesn't fit them."""
+        if not cursor:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, binascii.Error):
+            return None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            return None
+        # Cursors come from the URL, so a tampered one must not reach filter()
+        try:
+            values = [self._model_field(name).to_python(value) for (name, _), value in zip(self._fields(), values)]
+        except (ValueError, TypeError, ValidationError):
+            return None
+        if any(value is None for value in values):
+            return None
+        return values
@@ -0,0 +1,144 @@
+# app/ranking.py
+
+import re
+import logging
+
+import numpy as np
+import scipy.sparse as sp
+from spacy.lang.en.stop_words import STOP_WORDS
+
+from .ats_score import (
+    EDUCATION_WEIGHT, EXPERIENCE_WEIGHT, SKILL_WEIGHT,
+    ParsedResume, education_score, experience_score, load_resumes,
+)
+from .ats_timing import stage
+from .models import JobApplication
+from .resume_cache import get_default_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+# Keeps "c++", "c#", "node.js" and "ci/cd" as single terms
+TOKEN_RE = re.compile(r"[a-z][a-z0-9+#./]*[a-z0-9+#]|[a-z]")
+
+
+def tokenize(text: str) -> list:
+    return [t for t in TOKEN_RE.findall(text.lower()) if t not in STOP_WORDS]
+
+
+# ---------- TF-IDF ----------
+def tfidf_matrix(docs: list) -> sp.csr_matrix:
+    """L2-normalised TF-IDF rows (sublinear tf, smoothed idf) for tokenized docs."""
+    vocab = {}
+    indices, data, indptr = [], [], [0]
+    for tokens in docs:
+        counts = {}
+        for token in tokens:
+            col = vocab.setdefault(token, len(vocab))
+            counts[col] = counts.get(col, 0) + 1
+        indices.extend(counts)
+        data.extend(counts.values())
+        indptr.append(len(indices))
+
+    matrix = sp.csr_matrix(
+        (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(docs), len(vocab)),
+    )
+    matrix.data = 1.0 + np.log(matrix.data)
+
+    df = np.bincount(matrix.indices, minlength=len(vocab))
+    idf = np.log((1.0 + len(docs)) / (1.0 + df)) + 1.0
+    matrix = matrix @ sp.diags(idf)
+
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sp.csr_matrix(sp.diags(1.0 / norms) @ matrix)
+
+
+def tfidf_similarity(jd_text: str, texts: list) -> np.ndarray:
+    """Cosine similarity of each text to the JD, all in one sparse product.
+
+    The JD is row 0 of the same matrix, so idf is computed over the JD and
+    this job's resumes together.
+    """
+    with stage("tfidf", docs=len(texts)) as info:
+        matrix = tfidf_matrix([tokenize(jd_text)] + [tokenize(t) for t in texts])
+        info["terms"] = matrix.shape[1]
+        return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first, without sorting the rest."""
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+# ---------- Applicant Ranking ----------
+class RankedApplicant:
+    def __init__(self, application, score: float, similarity: float):
+        self.application = application
+        self.score = score
+        self.similarity = similarity
+
+
+def rank_applicants(job, k: int = None, n_process: int = 1, load_missing: bool = False, info: dict = None) -> list:
+    """A job's scored applicants ranked by TF-IDF similarity to the JD, blended like ats_score.
+
+    The similarity replaces the keyword-match component; experience and
+    education are scored exactly as in score_resume. Only applications
+    scored successfully are ranked, and their parsed resumes come from the
+    feature cache by the stored resume digest. Cache misses (after an
+    eviction or a features_fingerprint change) are re-extracted only with
+    `load_missing` (for the management command, not a request); any still
+    missing are queued for a full rescore, which refills the cache, and
+    counted in info["omitted"].
+    """
+    from .scoring import enqueue, job_jd
+
+    info = {} if info is None else info
+    info["omitted"] = 0
+    applications = list(
+        job.jobapplication_set.filter(scoring_status=JobApplication.SCORING_DONE)
+        .exclude(resume="").exclude(resume=None).select_related("job_seeker")
+    )
+    if not applications:
+        return []
+
+    cache = get_default_cache()
+    resumes = [None] * len(applications)
+    if cache:
+        for i, joba in enumerate(applications):
+            hit = cache.get(joba.resume_digest) if joba.resume_digest else None
+            if hit is not None:
+                resumes[i] = ParsedResume.from_dict(hit)
+    missing = [i for i, r in enumerate(resumes) if r is None]
+    if missing and load_missing:
+        loaded = load_resumes([applications[i].resume.path for i in missing], n_process=n_process, skip_failed=True)
+        for i, resume in zip(missing, loaded):
+            resumes[i] = resume
+
+    omitted = [applications[i].id for i, r in enumerate(resumes) if r is None]
+    if omitted:
+        info["omitted"] = len(omitted)
+        enqueue(JobApplication.objects.filter(id__in=omitted, scoring_status=JobApplication.SCORING_DONE))
+        logger.info("Ranking %d of %d scored applicant(s) of job %s; queued the rest for rescoring",
+                    len(applications) - len(omitted), len(applications), job.id)
+    keep = [i for i, r in enumerate(resumes) if r is not None]
+    if not keep:
+        return []
+    applications = [applications[i] for i in keep]
+    resumes = [resumes[i] for i in keep]
+
+    jd = job_jd(job)
+    similarity = tfidf_similarity(job.description, [r.text for r in resumes])
+    exp = np.array([experience_score(r, jd) for r in resumes])
+    edu = np.array([education_score(r, jd) for r in resumes])
+    combined = np.round((SKILL_WEIGHT * similarity + EXPERIENCE_WEIGHT * exp + EDUCATION_WEIGHT * edu) * 100, 1)
+
+    return [
+        RankedApplicant(applications[i], float(combined[i]), float(similarity[i]))
+        for i in top_k(combined, k)
+    ]
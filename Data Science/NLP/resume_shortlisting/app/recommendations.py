@@ -0,0 +1,74 @@
+# app/recommendations.py
+
+import math
+import heapq
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from .models import ApplicationSkill, JobApplication, JobKeyword, JobPost
+
+
+ACTIVE_JOBS_CACHE_KEY = "recommendations:active_jobs"
+ACTIVE_JOBS_TTL = 5 * 60
+
+
+def active_job_count() -> int:
+    """Number of active jobs (the N of idf), counted at most once per ACTIVE_JOBS_TTL.
+
+    idf is log(1 + N / df), so a count a few minutes stale barely moves the
+    weights, and the dashboard no longer counts JobPost on every load.
+    """
+    total = cache.get(ACTIVE_JOBS_CACHE_KEY)
+    if total is None:
+        total = JobPost.objects.filter(is_active=True).count()
+        cache.set(ACTIVE_JOBS_CACHE_KEY, total, ACTIVE_JOBS_TTL)
+    return total
+
+
+def seeker_skills(user) -> set:
+    """Taxonomy skills stored for the seeker's most recently scored application."""
+    latest = (
+        JobApplication.objects.filter(job_seeker=user, scoring_status=JobApplication.SCORING_DONE)
+        .order_by('-applied_at', '-id')
+        .values_list('id', flat=True)
+        .first()
+    )
+    if latest is None:
+        return set()
+    return set(ApplicationSkill.objects.filter(application_id=latest).values_list('skill', flat=True))
+
+
+def recommend_jobs(user, limit: int = 6, skills: set = None) -> list:
+    """Active jobs the seeker hasn't applied to, ranked by the idf-weighted skills they share.
+
+    Reads the JobKeyword inverted index for the seeker's skills only, so the
+    cost depends on how many jobs share a skill, not on how many jobs exist.
+    """
+    skills = seeker_skills(user) if skills is None else skills
+    if not skills:
+        return []
+
+    postings = defaultdict(list)
+    # The index only holds active jobs (see JobPost.sync_keyword_index)
+    for job_id, keyword in JobKeyword.objects.filter(keyword__in=skills).values_list('job_id', 'keyword'):
+        postings[keyword].append(job_id)
+    if not postings:
+        return []
+
+    # Rarer skills say more about fit than ones every job lists. Every indexed
+    # job is active, so a stale count is never below the jobs seen here.
+    total = max(active_job_count(), len({job_id for job_ids in postings.values() for job_id in job_ids}))
+    scores = defaultdict(float)
+    for keyword, job_ids in postings.items():
+        idf = math.log(1.0 + total / len(job_ids))
+        for job_id in job_ids:
+            scores[job_id] += idf
+
+    applied = set(JobApplication.objects.filter(job_seeker=user).values_list('job_id', flat=True))
+    best = heapq.nlargest(
+        limit,
+        ((score, job_id) for job_id, score in scores.items() if job_id not in applied),
+    )
+    jobs = JobPost.objects.in_bulk([job_id for _, job_id in best])
+    return [jobs[job_id] for _, job_id in best if job_id in jobs]
@@ -0,0 +1,178 @@
+# app/resume_cache.py
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import functools
+from importlib import metadata
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the features ParsedResume stores change in shape or meaning
+FEATURES_VERSION = 1
+
+# Writes between full rescans of the directory, which pick up other processes' writes
+RESCAN_EVERY = 1000
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's bytes, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def features_fingerprint() -> str:
+    """Short hash of the code version, model and settings that shape cached features.
+
+    Part of every cache key, so changing the extraction backend or limits,
+    the skill extractor or the spaCy model starts a fresh namespace instead
+    of serving features produced under the old configuration.
+    """
+    from django.conf import settings
+
+    config = {"version": FEATURES_VERSION, "spacy": _package_version("spacy"),
+              "model": _package_version("en_core_web_sm")}
+    if settings.configured:
+        for name in ("ATS_PDF_BACKEND", "ATS_EXTRACT_MAX_PAGES", "ATS_EXTRACT_MAX_CHARS",
+                     "ATS_SKILL_EXTRACTOR", "ATS_SKILLS_FILE"):
+            config[name] = str(getattr(settings, name, ""))
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class ResumeCache:
+    """Content-addressed store of extracted resume features, one JSON file per digest.
+
+    Entries live in `<directory>/<digest[:2]>/<digest>-<fingerprint>.json`. Reads
+    refresh the file's mtime, so once the directory grows past `max_bytes` the
+    least recently used entries are evicted first, down to `low_water` of it.
+    The size is tracked as a running total; the directory is only scanned on
+    the first write, on eviction and every RESCAN_EVERY writes.
+    """
+
+    def __init__(self, directory, max_bytes: int = 200 * 1024 * 1024, fingerprint: str = "",
+                 low_water: float = 0.9):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+        self.low_water = low_water
+        self._total = None
+        self._writes = 0
+
+    def _path(self, digest: str) -> str:
+        name = f"{digest}-{self.fingerprint}" if self.fingerprint else digest
+        return os.path.join(self.directory, digest[:2], f"{name}.json")
+
+    def get(self, digest: str):
+        path = self._path(digest)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning("Dropping unreadable resume cache entry %s", path)
+            self.delete(digest)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, digest: str, data: dict) -> None:
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        # Write then rename, so concurrent workers never read a partial entry
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        size = os.path.getsize(tmp)
+        os.replace(tmp, path)
+
+        self._writes += 1
+        if self._total is None or self._writes % RESCAN_EVERY == 0:
+            self._total = sum(size for _, size, _ in self.entries())
+        else:
+            self._total += size - replaced
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def entries(self) -> list:
+        """(mtime, size, path) of every entry."""
+        found = []
+        if not os.path.isdir(self.directory):
+            return found
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".json"):
+                    st = entry.stat()
+                    found.append((st.st_mtime, st.st_size, entry.path))
+        return found
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits in low_water * max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.low_water
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        self._total = total
+        return removed
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    """The cache configured by settings.ATS_CACHE_DIR, or None when caching is off.
+
+    One instance per process and configuration, so its running size total
+    survives between calls.
+    """
+    global _default_cache
+    from django.conf import settings
+
+    if not settings.configured or not getattr(settings, "ATS_CACHE_DIR", None):
+        return None
+    config = (
+        str(settings.ATS_CACHE_DIR),
+        getattr(settings, "ATS_CACHE_MAX_BYTES", 200 * 1024 * 1024),
+        features_fingerprint(),
+    )
+    if _default_cache is None or _default_cache[0] != config:
+        _default_cache = (config, ResumeCache(*config))
+    return _default_cache[1]
@@ -0,0 +1,368 @@
+# app/scoring.py
+
+import os
+import logging
+from collections import Counter
+from datetime import timedelta
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, as_completed
+
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .ats_score import ParsedResume, ats_score_with_features, score_resume
+from .ats_timing import stage
+from .duplicates import index_signatures
+from .models import ApplicationSkill, JobApplication, JobPost
+from .resume_cache import file_sha256, get_default_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- Queue ----------
+def get_claim_timeout() -> float:
+    """Seconds after which a 'running' claim counts as abandoned (settings.ATS_CLAIM_TIMEOUT)."""
+    from django.conf import settings
+
+    default = 30 * 60
+    return getattr(settings, "ATS_CLAIM_TIMEOUT", default) if settings.configured else default
+
+
+def _stale_claims(timeout: float) -> Q:
+    # Rows claimed before claimed_at existed have no timestamp and count as stale
+    return Q(scoring_status=JobApplication.SCORING_RUNNING) & (
+        Q(claimed_at__lt=timezone.now() - timedelta(seconds=timeout)) | Q(claimed_at__isnull=True)
+    )
+
+
+def claim_pending(limit: int, queryset=None) -> list:
+    """Mark up to `limit` pending applications as running and return them.
+
+    The status flip is a conditional UPDATE, so two workers polling the same
+    table never claim the same row. Claims older than get_claim_timeout()
+    (a worker that died mid-batch) are claimed again like pending rows.
+    `queryset` narrows the applications considered (e.g. one job's).
+    """
+    if queryset is None:
+        queryset = JobApplication.objects.all()
+    claimable = Q(scoring_status=JobApplication.SCORING_PENDING) | _stale_claims(get_claim_timeout())
+    ids = list(queryset.filter(claimable).order_by("id").values_list("id", flat=True)[:limit])
+    now = timezone.now()
+    claimed = [
+        app_id for app_id in ids
+        if JobApplication.objects.filter(claimable, id=app_id).update(
+            scoring_status=JobApplication.SCORING_RUNNING, claimed_at=now,
+        )
+    ]
+    return list(JobApplication.objects.filter(id__in=claimed).select_related("job"))
+
+
+def release(applications) -> int:
+    """Put claimed applications whose result was never written back in the queue."""
+    return JobApplication.objects.filter(
+        id__in=[joba.id for joba in applications], scoring_status=JobApplication.SCORING_RUNNING,
+    ).update(scoring_status=JobApplication.SCORING_PENDING, claimed_at=None)
+
+
+def requeue_running(queryset=None, older_than: float = None) -> int:
+    """Put applications left in 'running' by a killed worker back in the queue.
+
+    With `older_than` (seconds), only claims at least that old are reset, so
+    rows a live worker is still scoring are left alone.
+    """
+    if queryset is None:
+        queryset = JobApplication.objects.all()
+    running = _stale_claims(older_than) if older_than is not None else Q(scoring_status=JobApplication.SCORING_RUNNING)
+    return queryset.filter(running).update(scoring_status=JobApplication.SCORING_PENDING, claimed_at=None)
+
+
+def enqueue(queryset) -> int:
+    """Mark applications for (re)scoring."""
+    return queryset.update(scoring_status=JobApplication.SCORING_PENDING)
+
+
+# ---------- Scoring ----------
+def job_jd(job):
+    """The job's stored JD features, computing and saving them once if missing."""
+    if job.jd_keywords is None:
+        job.refresh_jd_features()
+        job.save(update_fields=["jd_keywords", "jd_years", "jd_education", "jd_skills"])
+    return job.parsed_jd()
+
+
+def _score_task(app_id: int, resume_path: str, jd, digest: str = None) -> tuple:
+    """Runs in a pool process; returns (application id, score, resume features, error message)."""
+    try:
+        score, features = ats_score_with_features(resume_path, jd, digest=digest)
+        return app_id, score, features, ""
+    except Exception as exc:
+        logger.exception("ATS scoring failed for application %s", app_id)
+        return app_id, None, None, f"{type(exc).__name__}: {exc}"
+
+
+def _result_fields(score, features, error: str) -> dict:
+    if error:
+        return {
+            "scoring_status": JobApplication.SCORING_FAILED,
+            "scoring_error": error,
+            "scored_at": timezone.now(),
+        }
+    return {
+        "ats_score": score,
+        "experience_years": features["experience_years"],
+        "education_tier": features["education_tier"],
+        "minhash": features["minhash"],
+        "resume_digest": features["digest"],
+        "scoring_status": JobApplication.SCORING_DONE,
+        "scoring_error": "",
+        "scored_at": timezone.now(),
+    }
+
+
+def _replace_skills(skills_by_app: dict) -> None:
+    """Swap the stored ApplicationSkill rows of each application for a new set."""
+    ApplicationSkill.objects.filter(application_id__in=list(skills_by_app)).delete()
+    ApplicationSkill.objects.bulk_create([
+        ApplicationSkill(application_id=app_id, skill=skill)
+        for app_id, skills in skills_by_app.items()
+        for skill in skills
+    ])
+
+
+def _requeue_stale(app_ids) -> set:
+    """Requeue applications claimed before their job's JD last changed; returns their ids.
+
+    Their result was computed against the old description, and
+    rescore_from_cache only revisits finished rows, so saving it would
+    leave a stale score behind.
+    """
+    stale = set(
+        JobApplication.objects.filter(id__in=list(app_ids), claimed_at__lt=F("job__jd_updated_at"))
+        .values_list("id", flat=True)
+    )
+    if stale:
+        JobApplication.objects.filter(id__in=list(stale)).update(
+            scoring_status=JobApplication.SCORING_PENDING, claimed_at=None,
+        )
+    return stale
+
+
+def save_result(app_id: int, score, features: dict = None, error: str = "") -> None:
+    with transaction.atomic():
+        if _requeue_stale([app_id]):
+            return
+        JobApplication.objects.filter(id=app_id).update(**_result_fields(score, features, error))
+        if not error:
+            _replace_skills({app_id: features["skills"]})
+            index_signatures({app_id: features["minhash"]})
+
+
+def bulk_save_results(results) -> int:
+    """Write many (application id, score, features, error) results with one bulk_update.
+
+    Results for applications whose JD changed after they were claimed are
+    dropped and the applications requeued; the return value counts only
+    the results written.
+    """
+    results = list(results)
+    # Failures keep their previous ats_score and features, so they are written separately
+    by_fields = {}
+    skills_by_app = {}
+    signatures = {}
+    with transaction.atomic():
+        stale = _requeue_stale(r[0] for r in results)
+        for app_id, score, features, error in results:
+            if app_id in stale:
+                continue
+            fields = _result_fields(score, features, error)
+            by_fields.setdefault(tuple(fields), []).append(JobApplication(id=app_id, **fields))
+            if not error:
+                skills_by_app[app_id] = features["skills"]
+                signatures[app_id] = features["minhash"]
+        for fields, objs in by_fields.items():
+            JobApplication.objects.bulk_update(objs, list(fields))
+        _replace_skills(skills_by_app)
+        index_signatures(signatures)
+    return sum(len(objs) for objs in by_fields.values())
+
+
+def iter_scores(applications, executor=None):
+    """Yield (application id, score, features, error) per application, as results arrive.
+
+    Applications of one job whose resume files have the same SHA-256 (the
+    same bytes, e.g. one resume uploaded twice) are scored once in this
+    batch and the result is copied. Only files whose size matches another
+    file of the same job are hashed here, and that digest is passed on so
+    the worker doesn't hash the file again. Across batches the feature
+    cache, keyed by the same digest, already skips the parse.
+    """
+    jds = {}
+    candidates = []
+    for joba in applications:
+        if not joba.resume:
+            yield joba.id, None, None, "No resume uploaded"
+            continue
+        if joba.job_id not in jds:
+            jds[joba.job_id] = job_jd(joba.job)
+        try:
+            size = os.path.getsize(joba.resume.path)
+        except OSError:
+            # Let the task report the unreadable file
+            size = None
+        candidates.append((joba, size))
+
+    sizes = Counter((joba.job_id, size) for joba, size in candidates if size is not None)
+    tasks = []
+    same_file = {}
+    copies = {}
+    for joba, size in candidates:
+        digest = None
+        if size is not None and sizes[joba.job_id, size] > 1:
+            try:
+                digest = file_sha256(joba.resume.path)
+            except OSError:
+                pass
+        if digest:
+            key = (joba.job_id, digest)
+            if key in same_file:
+                copies.setdefault(same_file[key], []).append(joba.id)
+                continue
+            same_file[key] = joba.id
+        tasks.append((joba.id, joba.resume.path, jds[joba.job_id], digest))
+
+    if executor is None:
+        results = (_score_task(*task) for task in tasks)
+    else:
+        results = _pool_results(executor, tasks)
+    for app_id, score, features, error in results:
+        yield app_id, score, features, error
+        for other_id in copies.get(app_id, ()):
+            yield other_id, score, features, error
+
+
+def _pool_results(executor, tasks):
+    """_score_task results from the pool; a task the pool itself lost (e.g. its process was killed) fails."""
+    futures = {}
+    for task in tasks:
+        try:
+            futures[executor.submit(_score_task, *task)] = task[0]
+        except BrokenExecutor as exc:
+            yield task[0], None, None, f"{type(exc).__name__}: {exc}"
+    for future in as_completed(futures):
+        try:
+            yield future.result()
+        except Exception as exc:
+            logger.error("Scoring pool lost application %s: %s", futures[future], exc)
+            yield futures[future], None, None, f"{type(exc).__name__}: {exc}"
+
+
+def score_applications(applications, executor=None) -> int:
+    """Score applications (in `executor` if given) and store each result as it arrives."""
+    done = 0
+    for app_id, score, features, error in iter_scores(applications, executor):
+        save_result(app_id, score, features, error)
+        done += 1
+    return done
+
+
+# ---------- JD Edits ----------
+def request_jd_rescore(job) -> None:
+    """Ask score_worker to rescore a job's applications after its description changed.
+
+    jd_updated_at also makes results still in flight for the old JD be
+    requeued instead of saved (see _requeue_stale).
+    """
+    now = timezone.now()
+    JobPost.objects.filter(id=job.id).update(rescore_requested_at=now, jd_updated_at=now)
+
+
+def claim_jd_rescores(limit: int = 10) -> list:
+    """Jobs with a pending JD rescore, each claimed by clearing its request.
+
+    The clear is conditional on the timestamp, so an edit made while the
+    job is being rescored leaves a fresh request behind.
+    """
+    requested = list(
+        JobPost.objects.filter(rescore_requested_at__isnull=False)
+        .order_by("rescore_requested_at")
+        .values_list("id", "rescore_requested_at")[:limit]
+    )
+    claimed = [
+        job_id for job_id, requested_at in requested
+        if JobPost.objects.filter(id=job_id, rescore_requested_at=requested_at).update(rescore_requested_at=None)
+    ]
+    return list(JobPost.objects.filter(id__in=claimed))
+
+
+def rescore_from_cache(job, cache=None, chunk_size: int = 500) -> tuple:
+    """Recompute a job's scored applications against its current JD from cached resume features.
+
+    Only score_resume runs: no file is read, hashed or parsed, and the stored
+    JD-independent features (skills, experience, education, MinHash) are
+    kept. Applications whose features are not in the cache are queued for a
+    full rescore instead. Returns (rescored, queued).
+    """
+    cache = cache or get_default_cache()
+    jd = job_jd(job)
+    applications = (
+        JobApplication.objects.filter(job=job, scoring_status=JobApplication.SCORING_DONE)
+        .only("id", "resume_digest")
+        .order_by("id")
+    )
+    rescored = 0
+    missing = []
+    batch = []
+    with stage("jd_rescore", job=job.id) as info:
+        for joba in applications.iterator(chunk_size=chunk_size):
+            features = cache.get(joba.resume_digest) if cache and joba.resume_digest else None
+            if features is None:
+                missing.append(joba.id)
+                continue
+            joba.ats_score = score_resume(ParsedResume.from_dict(features), jd)
+            joba.scored_at = timezone.now()
+            batch.append(joba)
+            if len(batch) >= chunk_size:
+                JobApplication.objects.bulk_update(batch, ["ats_score", "scored_at"])
+                rescored += len(batch)
+                batch = []
+        if batch:
+            JobApplication.objects.bulk_update(batch, ["ats_score", "scored_at"])
+            rescored += len(batch)
+        queued = enqueue(JobApplication.objects.filter(id__in=missing)) if missing else 0
+        info.update(rescored=rescored, queued=queued)
+    return rescored, queued
+
+
+class ScoringPool:
+    """A ProcessPoolExecutor that starts a fresh pool when the current one is broken.
+
+    A child killed mid-task (e.g. by the OOM killer) breaks the whole pool;
+    that batch's tasks fail, and the next submit() gets a new pool instead
+    of failing forever.
+    """
+
+    def __init__(self, processes: int):
+        self.processes = processes
+        self._executor = self._start()
+
+    def _start(self) -> ProcessPoolExecutor:
+        # Forked children must not share the parent's open DB connections.
+        connections.close_all()
+        return ProcessPoolExecutor(max_workers=self.processes)
+
+    def submit(self, fn, *args, **kwargs):
+        try:
+            return self._executor.submit(fn, *args, **kwargs)
+        except BrokenExecutor:
+            logger.warning("Scoring pool broken, starting a new one")
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._start()
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def make_executor(processes: int) -> ScoringPool:
+    return ScoringPool(processes)
@@ -0,0 +1,53 @@
+# app/search.py
+
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+
+# SQLite FTS5 index over JobPost, kept in sync by triggers (see migration 0008).
+# A migration that makes SQLite rebuild app_jobpost drops those triggers; it
+# must recreate them with its own copy of the SQL in 0008.
+FTS_TABLE = "app_jobpost_fts"
+
+# bm25 column weights: job_title, company, description
+FTS_WEIGHTS = (10.0, 5.0, 1.0)
+
+def fts_query(text: str) -> str:
+    """Turn free-text input into an FTS5 query: every word, as a prefix, must match."""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def search_jobs(jobs, text: str):
+    """Filter a JobPost queryset to matches for `text`, best matches first.
+
+    Every path annotates `search_rank` (lower is better), so callers can
+    order and paginate on it whatever the backend or query.
+    """
+    unranked = Value(0.0, output_field=FloatField())
+    if connection.vendor != "sqlite":
+        return jobs.filter(
+            Q(job_title__icontains=text) |
+            Q(company__icontains=text) |
+            Q(description__icontains=text)
+        ).annotate(search_rank=unranked).order_by("-posted_at")
+
+    match = fts_query(text)
+    if not match:
+        # Nothing searchable (e.g. only punctuation): every job matches equally
+        return jobs.annotate(search_rank=unranked).order_by("-posted_at")
+
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    return jobs.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+    ).annotate(
+        # bm25 is lower for better matches
+        search_rank=RawSQL(
+            f"SELECT bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = app_jobpost.id",
+            (match,),
+        )
+    ).order_by("search_rank", "-posted_at")
@@ -0,0 +1,187 @@
+# app/skills.py
+
+import json
+
+
+# Canonical skill -> aliases. The canonical name is always matched too.
+# Ambiguous words ("go", "r", "cv", "rest", "excel") are only listed in unambiguous forms.
+SKILL_TAXONOMY = {
+    # Languages
+    "python": ["python3", "python 3"],
+    "java": ["java 8", "java 11", "java 17"],
+    "javascript": ["js", "ecmascript", "es6"],
+    "typescript": [],
+    "c++": ["cpp"],
+    "c#": ["csharp", "c sharp"],
+    "golang": ["go lang"],
+    "rust": [],
+    "kotlin": [],
+    "swift": [],
+    "php": [],
+    "ruby": [],
+    "scala": [],
+    "r programming": ["rstudio"],
+    "matlab": [],
+    "dart": [],
+    "bash": ["shell scripting", "shell script"],
+    "sql": ["t-sql", "pl/sql", "plsql"],
+    "html": ["html5"],
+    "css": ["css3"],
+    # Web frameworks
+    "django": ["django rest framework", "drf"],
+    "flask": [],
+    "fastapi": [],
+    "spring boot": ["spring framework", "spring mvc"],
+    "node.js": ["nodejs", "node js"],
+    "express.js": ["expressjs"],
+    "react": ["react.js", "reactjs", "react js"],
+    "angular": ["angularjs", "angular.js"],
+    "vue.js": ["vue", "vuejs"],
+    "next.js": ["nextjs"],
+    ".net": ["dotnet", "asp.net", ".net core"],
+    "laravel": [],
+    "ruby on rails": ["rails"],
+    "bootstrap": [],
+    "tailwind css": ["tailwind", "tailwindcss"],
+    "jquery": [],
+    "flutter": [],
+    "react native": [],
+    "android": ["android development"],
+    "ios": ["ios development"],
+    # Data & ML
+    "machine learning": ["ml"],
+    "deep learning": [],
+    "artificial intelligence": ["ai"],
+    "natural language processing": ["nlp"],
+    "computer vision": ["opencv"],
+    "data science": [],
+    "data analysis": ["data analytics", "data analyst"],
+    "data visualization": ["data visualisation"],
+    "statistics": ["statistical analysis"],
+    "pandas": [],
+    "numpy": [],
+    "scipy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "tensorflow": ["keras"],
+    "pytorch": ["torch"],
+    "spacy": [],
+    "nltk": [],
+    "hugging face": ["huggingface", "transformers"],
+    "power bi": ["powerbi"],
+    "tableau": [],
+    "microsoft excel": ["ms excel", "advanced excel", "excel spreadsheets"],
+    "spark": ["apache spark", "pyspark"],
+    "hadoop": [],
+    "airflow": ["apache airflow"],
+    "etl": [],
+    "big data": [],
+    # Databases
+    "mysql": [],
+    "postgresql": ["postgres"],
+    "sqlite": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "oracle": ["oracle db"],
+    "sql server": ["mssql", "ms sql"],
+    "elasticsearch": ["elastic search"],
+    "firebase": [],
+    # Cloud & DevOps
+    "aws": ["amazon web services", "aws lambda", "ec2"],
+    "azure": ["microsoft azure"],
+    "gcp": ["google cloud", "google cloud platform"],
+    "docker": ["dockerfile", "containerization"],
+    "kubernetes": ["k8s"],
+    "terraform": [],
+    "ansible": [],
+    "jenkins": [],
+    "ci/cd": ["ci cd", "continuous integration", "continuous deployment"],
+    "git": ["github", "gitlab", "bitbucket"],
+    "linux": ["unix", "ubuntu"],
+    "nginx": [],
+    "microservices": ["microservice"],
+    "rest api": ["restful", "rest apis", "restful api", "api development"],
+    "graphql": [],
+    # Practice & tooling
+    "agile": ["scrum", "kanban"],
+    "jira": [],
+    "unit testing": ["pytest", "junit", "unittest"],
+    "selenium": [],
+    "figma": [],
+    "ui/ux": ["ui ux", "ux design", "ui design", "user experience"],
+    "photoshop": ["adobe photoshop"],
+    "seo": ["search engine optimization"],
+    "digital marketing": [],
+    "project management": ["pmp"],
+    "cybersecurity": ["cyber security", "information security"],
+    "networking": ["computer networks", "tcp/ip"],
+}
+
+
+class SkillMatcher:
+    """Finds taxonomy skills in text in one pass of a compiled PhraseMatcher.
+
+    Only the tokenizer runs (no tagger/parser), and the matcher looks up token
+    hashes, so the cost grows with text length rather than taxonomy size.
+    """
+
+    def __init__(self, taxonomy: dict):
+        import spacy
+        from spacy.matcher import PhraseMatcher
+
+        self.nlp = spacy.blank("en")
+        self.matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        self.canonical = {}
+        for skill, aliases in taxonomy.items():
+            key = f"skill:{skill}"
+            self.canonical[self.nlp.vocab.strings.add(key)] = skill
+            phrases = {skill, *aliases}
+            self.matcher.add(key, list(self.nlp.tokenizer.pipe(phrases)))
+
+    def find(self, text: str) -> set:
+        doc = self.nlp.make_doc(text)
+        return {self.canonical[match_id] for match_id, _, _ in self.matcher(doc)}
+
+
+def load_taxonomy() -> dict:
+    """SKILL_TAXONOMY extended by the JSON file at settings.ATS_SKILLS_FILE, if any."""
+    from django.conf import settings
+
+    taxonomy = {skill: list(aliases) for skill, aliases in SKILL_TAXONOMY.items()}
+    path = getattr(settings, "ATS_SKILLS_FILE", None) if settings.configured else None
+    if path:
+        with open(path, encoding="utf-8") as f:
+            for skill, aliases in json.load(f).items():
+                skill = skill.lower()
+                taxonomy.setdefault(skill, [])
+                taxonomy[skill].extend(a.lower() for a in aliases)
+    return taxonomy
+
+
+_matcher = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Compile the taxonomy once per process, on first use."""
+    global _matcher
+    if _matcher is None:
+        _matcher = SkillMatcher(load_taxonomy())
+    return _matcher
+
+
+_aliases = None
+
+
+def canonical_skill(term: str) -> str:
+    """The taxonomy name for a skill or alias ("k8s" -> "kubernetes"), as extraction stores it.
+
+    Unknown terms come back lowercased with whitespace collapsed. Needs only
+    the taxonomy, not spaCy, so views can call it.
+    """
+    global _aliases
+    if _aliases is None:
+        _aliases = {}
+        for skill, aliases in load_taxonomy().items():
+            for name in (*aliases, skill):
+                _aliases[" ".join(name.lower().split())] = skill
+    term = " ".join(term.lower().split())
+    return _aliases.get(term, term)
@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .ats_score import ParsedResume
+from .models import ApplicationSkill, JobApplication, JobPost
+from .ranking import rank_applicants
+from .resume_cache import get_default_cache
+
+
+class ApplicantViewTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        override = override_settings(MEDIA_ROOT=self.tmp + "/media", ATS_CACHE_DIR=self.tmp + "/cache")
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.company = User.objects.create_user("acme")
+        self.job = JobPost.objects.create(
+            user=self.company, job_title="Backend Developer", company="Acme", location="Remote",
+            job_type="Full-time", experience="3 years", description="Python and Django developer",
+            last_date=date(2030, 1, 1), salary="100k", jd_keywords=["django", "python"], jd_years=3,
+            jd_education="bachelor", jd_skills=["django", "python"],
+        )
+        self.client.force_login(self.company)
+
+    def application(self, name, data, status, digest="", features=None):
+        joba = JobApplication(job=self.job, source_filename=name, scoring_status=status, resume_digest=digest)
+        joba.resume.save(name, ContentFile(data))
+        if features is not None:
+            get_default_cache().put(digest, features.to_dict())
+        return joba
+
+    def test_ranking_skips_failed_and_unloadable_resumes(self):
+        # A malformed PDF used to be extracted in the request and raise PdfminerException
+        self.application("broken.pdf", b"%PDF-1.4 not really", JobApplication.SCORING_FAILED)
+        uncached = self.application("uncached.pdf", b"%PDF-1.4 also broken", JobApplication.SCORING_DONE, "b" * 64)
+        good = self.application(
+            "good.txt", b"Python Django developer", JobApplication.SCORING_DONE, "a" * 64,
+            ParsedResume("Python Django developer, 4 years", {"python", "django"}, [], 4),
+        )
+
+        with mock.patch("app.ats_score.extract_text") as extract_text:
+            response = self.client.get(reverse("ranked_applicants", args=[self.job.id]))
+        self.assertEqual(response.status_code, 200)
+        extract_text.assert_not_called()
+        self.assertEqual([r.application.id for r in response.context["ranked"]], [good.id])
+        # The scored applicant without cached features is reported and queued, not silently dropped
+        self.assertEqual(response.context["omitted"], 1)
+        self.assertContains(response, "1 scored applicant could not be ranked")
+        uncached.refresh_from_db()
+        self.assertEqual(uncached.scoring_status, JobApplication.SCORING_PENDING)
+
+        # The command may re-extract cache misses; files that fail to load are skipped
+        JobApplication.objects.filter(id=uncached.id).update(scoring_status=JobApplication.SCORING_DONE)
+        info = {}
+        with self.assertLogs("app.ats_score", "WARNING"):
+            ranked = rank_applicants(self.job, load_missing=True, info=info)
+        self.assertEqual([r.application.id for r in ranked], [good.id])
+        self.assertEqual(info["omitted"], 1)
+
+    def test_skill_filter_resolves_aliases(self):
+        kube = JobApplication.objects.create(job=self.job, scoring_status=JobApplication.SCORING_DONE)
+        ApplicationSkill.objects.create(application=kube, skill="kubernetes")
+        both = JobApplication.objects.create(job=self.job, scoring_status=JobApplication.SCORING_DONE)
+        ApplicationSkill.objects.bulk_create([
+            ApplicationSkill(application=both, skill="kubernetes"),
+            ApplicationSkill(application=both, skill="javascript"),
+        ])
+
+        url = reverse("job_applicants", args=[self.job.id])
+        response = self.client.get(url, {"skills": "K8s"})
+        self.assertEqual({a.id for a in response.context["page"]}, {kube.id, both.id})
+        response = self.client.get(url, {"skills": "k8s, JS"})
+        self.assertEqual([a.id for a in response.context["page"]], [both.id])
+        self.assertEqual(response.context["skills"], "kubernetes, javascript")
@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from .duplicates import index_signatures
+from .minhash import minhash_signature
+from .models import JobApplication, JobPost
+
+
+RESUME = (
+    "Jane Doe. Senior backend engineer with 7 years of Python, Django and PostgreSQL. "
+    "Built payment APIs serving millions of requests, led a team of five, migrated "
+    "services to Kubernetes on AWS and introduced CI/CD with GitHub Actions. "
+    "BSc Computer Science, University of Leeds."
+)
+
+
+class IndexSignaturesTests(TestCase):
+    def setUp(self):
+        self.job = JobPost.objects.create(
+            user=User.objects.create_user("acme"), job_title="Developer", company="Acme",
+            location="Remote", job_type="Full-time", experience="2 years", description="Python",
+            last_date=date(2030, 1, 1), salary="100k", jd_skills=[],
+        )
+
+    def application(self, text):
+        return JobApplication.objects.create(job=self.job, minhash=minhash_signature(text))
+
+    def index(self, *applications):
+        # One call per application, in the order results happened to complete
+        for joba in applications:
+            index_signatures({joba.id: joba.minhash})
+        return [JobApplication.objects.get(id=joba.id).duplicate_of_id for joba in applications]
+
+    def test_later_application_indexed_first_is_still_linked(self):
+        first = self.application(RESUME)
+        second = self.application(RESUME + " References available on request.")
+        self.assertEqual(self.index(second, first), [first.id, None])
+
+    def test_groups_merge_under_the_lowest_id(self):
+        a = self.application(RESUME)
+        b = self.application(RESUME + " Fluent in Spanish.")
+        c = self.application(RESUME + " References available on request.")
+        other = self.application("Pastry chef with ten years in French patisserie and bakery management.")
+        self.assertEqual(self.index(c, other, b, a), [a.id, None, a.id, None])
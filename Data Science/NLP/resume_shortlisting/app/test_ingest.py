@@ -0,0 +1,79 @@
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from .ingest import iter_entries, store_entries
+from .models import JobApplication, JobPost
+
+
+def make_zip(files: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+class StoreEntriesTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.job = JobPost.objects.create(
+            user=User.objects.create_user("acme"), job_title="Developer", company="Acme",
+            location="Remote", job_type="Full-time", experience="2 years", description="Python",
+            last_date=date(2030, 1, 1), salary="100k", jd_skills=[],
+        )
+
+    def test_zip_creates_pending_applications_in_batches(self):
+        archive = make_zip({
+            "resumes/alice.txt": b"Alice, Python",
+            "resumes/bob.pdf": b"%PDF-1.4",
+            "resumes/carol.docx": b"PK",
+            "__MACOSX/resumes/._alice.txt": b"",
+            ".DS_Store": b"",
+            "resumes/photo.png": b"",
+            "resumes/huge.txt": b"x" * 200,
+        })
+        batches = list(store_entries(self.job, iter_entries(archive), batch_size=2, max_bytes=100))
+
+        self.assertEqual([len(created) for created, _ in batches], [2, 1])
+        report = [row for _, rows in batches for row in rows]
+        errors = {row["file"]: row["error"] for row in report if "error" in row}
+        self.assertEqual(set(errors), {"resumes/photo.png", "resumes/huge.txt"})
+        self.assertTrue(errors["resumes/huge.txt"].startswith("File too large"))
+
+        applications = JobApplication.objects.filter(job=self.job).order_by("id")
+        self.assertEqual(
+            [a.source_filename for a in applications],
+            ["resumes/alice.txt", "resumes/bob.pdf", "resumes/carol.docx"],
+        )
+        self.assertTrue(all(a.scoring_status == JobApplication.SCORING_PENDING for a in applications))
+        self.assertTrue(all(a.job_seeker is None for a in applications))
+        with applications[0].resume.open("rb") as f:
+            self.assertEqual(f.read(), b"Alice, Python")
+        self.assertEqual(
+            {row["application"] for row in report if "application" in row},
+            {a.id for a in applications},
+        )
+
+    def test_directory_source(self):
+        source = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        os.makedirs(os.path.join(source, "b"))
+        for name in ("a.txt", os.path.join("b", "c.txt")):
+            with open(os.path.join(source, name), "wb") as f:
+                f.write(b"resume")
+
+        report = [row for _, rows in store_entries(self.job, iter_entries(source)) for row in rows]
+        self.assertEqual([row["file"] for row in report], ["a.txt", os.path.join("b", "c.txt")])
+        self.assertEqual(JobApplication.objects.filter(job=self.job).count(), 2)
@@ -0,0 +1,80 @@
+import base64
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import JobPost
+from .pagination import KeysetPaginator
+from .search import search_jobs
+
+
+def make_job(user, **fields):
+    defaults = dict(
+        job_title="Developer", company="Acme", location="Remote", job_type="Full-time",
+        experience="2 years", description="General software work", last_date=date(2030, 1, 1),
+        salary="100k", jd_skills=[],
+    )
+    defaults.update(fields)
+    return JobPost.objects.create(user=user, **defaults)
+
+
+class KeysetPaginatorTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user("acme")
+        posted = timezone.now()
+        # Pairs share posted_at, so pages must break ties on id
+        for i in range(11):
+            job = make_job(user, job_title=f"Job {i}")
+            JobPost.objects.filter(id=job.id).update(posted_at=posted - timedelta(hours=i // 2))
+        self.expected = list(JobPost.objects.order_by("-posted_at", "-id"))
+
+    def walk(self, paginator):
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            pages.append(paginator.get_page(after=pages[-1].next_cursor))
+        return pages
+
+    def test_forward_pages_cover_every_row_once(self):
+        pages = self.walk(KeysetPaginator(JobPost.objects.all(), 3))
+        self.assertEqual([len(p) for p in pages], [3, 3, 3, 2])
+        self.assertEqual([job for page in pages for job in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+    def test_previous_cursor_returns_the_earlier_page(self):
+        paginator = KeysetPaginator(JobPost.objects.all(), 3)
+        pages = self.walk(paginator)
+        for earlier, later in zip(pages, pages[1:]):
+            back = paginator.get_page(before=later.previous_cursor)
+            self.assertEqual(list(back), list(earlier))
+        self.assertFalse(paginator.get_page(before=pages[1].previous_cursor).has_previous())
+
+    def test_bad_cursor_falls_back_to_first_page(self):
+        paginator = KeysetPaginator(JobPost.objects.all(), 3)
+        for cursor in ("not-base64!", "W10=", "WyJ4Il0="):
+            self.assertEqual(list(paginator.get_page(after=cursor)), self.expected[:3])
+
+    def test_tampered_cursor_values_fall_back_to_first_page(self):
+        paginator = KeysetPaginator(JobPost.objects.all(), 3)
+        for values in (["a", "b"], [None, 1], [{}, []], ["2024-01-01T00:00:00", "x"]):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            self.assertEqual(list(paginator.get_page(after=cursor)), self.expected[:3])
+            self.assertEqual(list(paginator.get_page(before=cursor)), self.expected[:3])
+
+        # Both dashboards take the cursor straight from the query string
+        self.client.force_login(self.expected[0].user)
+        for url in (reverse("dashboard"), reverse("jobseeker_dashboard")):
+            response = self.client.get(url, {"after": "WyJhIiwgImIiXQ=="})
+            self.assertEqual(response.status_code, 200)
+
+    def test_search_results_page_by_rank(self):
+        JobPost.objects.filter(id__in=[j.id for j in self.expected[::2]]).update(description="Django developer")
+        jobs = search_jobs(JobPost.objects.all(), "django")
+        expected = list(jobs.order_by("search_rank", "-posted_at", "-id"))
+        pages = self.walk(KeysetPaginator(jobs, 4, ("search_rank", "-posted_at", "-id")))
+        self.assertEqual([job for page in pages for job in page], expected)
+        self.assertEqual(len(expected), 6)
@@ -0,0 +1,176 @@
+import shutil
+import tempfile
+from concurrent.futures import BrokenExecutor, Future
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .ats_score import ParsedResume
+from .models import JobApplication, JobPost
+from .resume_cache import ResumeCache
+from .scoring import (
+    _pool_results, bulk_save_results, claim_jd_rescores, claim_pending, iter_scores, release,
+    request_jd_rescore, requeue_running, rescore_from_cache, save_result,
+)
+
+
+def make_job(user, **fields):
+    # Stored JD features, so scoring never parses the description
+    defaults = dict(
+        job_title="Backend Developer", company="Acme", location="Remote", job_type="Full-time",
+        experience="3 years", description="Python and Django developer", last_date=date(2030, 1, 1),
+        salary="100k", jd_keywords=["django", "python"], jd_years=3, jd_education="bachelor",
+        jd_skills=["django", "python"],
+    )
+    defaults.update(fields)
+    return JobPost.objects.create(user=user, **defaults)
+
+
+class ClaimTests(TestCase):
+    def setUp(self):
+        self.job = make_job(User.objects.create_user("acme"))
+        self.apps = [JobApplication.objects.create(job=self.job) for _ in range(3)]
+
+    def test_claim_marks_running_and_is_exclusive(self):
+        claimed = claim_pending(2)
+        self.assertEqual([a.id for a in claimed], [a.id for a in self.apps[:2]])
+        for joba in JobApplication.objects.filter(id__in=[a.id for a in claimed]):
+            self.assertEqual(joba.scoring_status, JobApplication.SCORING_RUNNING)
+            self.assertIsNotNone(joba.claimed_at)
+        # A second worker only gets what is left
+        self.assertEqual([a.id for a in claim_pending(10)], [self.apps[2].id])
+        self.assertEqual(claim_pending(10), [])
+
+    @override_settings(ATS_CLAIM_TIMEOUT=60)
+    def test_stale_claims_are_taken_over(self):
+        claim_pending(3)
+        JobApplication.objects.filter(id=self.apps[0].id).update(claimed_at=timezone.now() - timedelta(minutes=5))
+        JobApplication.objects.filter(id=self.apps[1].id).update(claimed_at=None)
+        self.assertEqual({a.id for a in claim_pending(10)}, {self.apps[0].id, self.apps[1].id})
+
+    def test_release_puts_unscored_claims_back(self):
+        claimed = claim_pending(3)
+        JobApplication.objects.filter(id=claimed[0].id).update(scoring_status=JobApplication.SCORING_DONE)
+        self.assertEqual(release(claimed), 2)
+        statuses = dict(JobApplication.objects.values_list("id", "scoring_status"))
+        self.assertEqual(statuses[claimed[0].id], JobApplication.SCORING_DONE)
+        self.assertEqual(statuses[claimed[1].id], JobApplication.SCORING_PENDING)
+
+    def test_requeue_running_spares_live_claims(self):
+        claim_pending(3)
+        JobApplication.objects.filter(id=self.apps[0].id).update(claimed_at=timezone.now() - timedelta(hours=2))
+        self.assertEqual(requeue_running(older_than=3600), 1)
+        self.assertEqual(JobApplication.objects.get(id=self.apps[0].id).scoring_status, JobApplication.SCORING_PENDING)
+        self.assertEqual(requeue_running(), 2)
+
+
+class PoolResultsTests(TestCase):
+    def test_lost_tasks_fail_instead_of_raising(self):
+        class Executor:
+            def __init__(self):
+                self.calls = 0
+
+            def submit(self, fn, app_id, *args):
+                self.calls += 1
+                if self.calls == 3:
+                    raise BrokenExecutor("pool is broken")
+                future = Future()
+                if app_id == 1:
+                    future.set_result((1, 50.0, {}, ""))
+                else:
+                    future.set_exception(RuntimeError("worker died"))
+                return future
+
+        with self.assertLogs("app.scoring", "ERROR"):
+            results = {r[0]: r for r in _pool_results(Executor(), [(1, "a", None), (2, "b", None), (3, "c", None)])}
+        self.assertEqual(results[1], (1, 50.0, {}, ""))
+        self.assertEqual(results[2][3], "RuntimeError: worker died")
+        self.assertEqual(results[3][3], "BrokenExecutor: pool is broken")
+
+
+class IterScoresTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        self.job = make_job(User.objects.create_user("acme"))
+
+    def test_identical_files_are_scored_once(self):
+        with override_settings(MEDIA_ROOT=self.media):
+            apps = []
+            for name, data in [("a.txt", b"Python 5 years"), ("b.txt", b"Python 5 years"), ("c.txt", b"Java 2 years")]:
+                joba = JobApplication(job=self.job)
+                joba.resume.save(name, ContentFile(data))
+                apps.append(joba)
+            with mock.patch("app.scoring._score_task", side_effect=lambda app_id, path, jd, digest: (app_id, 10.0, {}, "")) as task:
+                results = sorted(iter_scores(JobApplication.objects.filter(job=self.job).select_related("job")))
+        self.assertEqual([c.args[0] for c in task.call_args_list], [apps[0].id, apps[2].id])
+        # Only the same-size pair was hashed, and its digest is passed on
+        self.assertIsNotNone(task.call_args_list[0].args[3])
+        self.assertIsNone(task.call_args_list[1].args[3])
+        self.assertEqual([r[0] for r in results], sorted(a.id for a in apps))
+
+
+class JDRescoreTests(TestCase):
+    def setUp(self):
+        self.job = make_job(User.objects.create_user("acme"))
+
+    def test_edit_during_rescore_leaves_a_new_request(self):
+        request_jd_rescore(self.job)
+        other = make_job(self.job.user)
+        self.assertEqual(claim_jd_rescores(), [self.job])
+        self.assertEqual(claim_jd_rescores(), [])
+        self.assertIsNone(JobPost.objects.get(id=other.id).rescore_requested_at)
+
+        # Another edit between listing and clearing keeps its request
+        request_jd_rescore(self.job)
+        real_filter = JobPost.objects.filter
+
+        def edit_then_filter(*args, **kwargs):
+            if "rescore_requested_at" in kwargs and kwargs["rescore_requested_at"] is not None:
+                JobPost.objects.filter(id=self.job.id).update(rescore_requested_at=timezone.now() + timedelta(seconds=1))
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(JobPost.objects, "filter", side_effect=edit_then_filter):
+            self.assertEqual(claim_jd_rescores(), [])
+        self.assertIsNotNone(JobPost.objects.get(id=self.job.id).rescore_requested_at)
+
+    def test_rescore_from_cache_rescores_hits_and_queues_misses(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache = ResumeCache(cache_dir)
+        cache.put("a" * 64, ParsedResume("Python Django developer", {"python", "django"}, [], 5).to_dict())
+        hit = JobApplication.objects.create(
+            job=self.job, resume_digest="a" * 64, ats_score=1.0, scoring_status=JobApplication.SCORING_DONE,
+        )
+        miss = JobApplication.objects.create(
+            job=self.job, resume_digest="b" * 64, ats_score=1.0, scoring_status=JobApplication.SCORING_DONE,
+        )
+        failed = JobApplication.objects.create(job=self.job, scoring_status=JobApplication.SCORING_FAILED)
+
+        self.assertEqual(rescore_from_cache(self.job, cache), (1, 1))
+        self.assertNotEqual(JobApplication.objects.get(id=hit.id).ats_score, 1.0)
+        self.assertEqual(JobApplication.objects.get(id=miss.id).scoring_status, JobApplication.SCORING_PENDING)
+        self.assertEqual(JobApplication.objects.get(id=failed.id).scoring_status, JobApplication.SCORING_FAILED)
+
+    def test_results_for_the_old_jd_are_requeued(self):
+        stale = [JobApplication.objects.create(job=self.job) for _ in range(2)]
+        fresh = JobApplication.objects.create(job=self.job)
+        claim_pending(2)
+        # The JD is edited while the first two applications are being scored
+        request_jd_rescore(self.job)
+        claim_pending(1)
+        features = {
+            "skills": ["python"], "minhash": None, "experience_years": 5, "education_tier": "bachelor", "digest": "",
+        }
+        save_result(stale[0].id, 80.0, features)
+        self.assertEqual(bulk_save_results([(stale[1].id, 80.0, features, ""), (fresh.id, 70.0, features, "")]), 1)
+
+        for joba in JobApplication.objects.filter(id__in=[a.id for a in stale]):
+            self.assertEqual(joba.scoring_status, JobApplication.SCORING_PENDING)
+            self.assertNotEqual(joba.ats_score, 80.0)
+            self.assertIsNone(joba.claimed_at)
+        self.assertEqual(JobApplication.objects.get(id=fresh.id).ats_score, 70.0)
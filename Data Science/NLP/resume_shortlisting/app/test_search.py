@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import JobPost
+from .search import search_jobs
+
+
+def make_job(user, **fields):
+    defaults = dict(
+        job_title="Developer", company="Acme", location="Remote", job_type="Full-time",
+        experience="2 years", description="General software work", last_date=date(2030, 1, 1),
+        salary="100k", jd_skills=[],
+    )
+    defaults.update(fields)
+    return JobPost.objects.create(user=user, **defaults)
+
+
+class SearchJobsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("acme")
+
+    def search(self, text):
+        return list(search_jobs(JobPost.objects.all(), text).order_by("search_rank", "-id"))
+
+    def test_prefix_match_ranks_title_above_description(self):
+        in_description = make_job(self.user, description="We use Kubernetes daily")
+        in_title = make_job(self.user, job_title="Kubernetes Engineer")
+        make_job(self.user, job_title="Accountant")
+        self.assertEqual(self.search("kube"), [in_title, in_description])
+        self.assertEqual(self.search("kubernetes engineer"), [in_title])
+
+    def test_triggers_follow_updates_and_deletes(self):
+        job = make_job(self.user, job_title="Data Analyst")
+        self.assertEqual(self.search("analyst"), [job])
+
+        job.job_title = "Data Scientist"
+        job.save()
+        self.assertEqual(self.search("analyst"), [])
+        self.assertEqual(self.search("scientist"), [job])
+
+        job.delete()
+        self.assertEqual(self.search("scientist"), [])
+
+    def test_query_punctuation_is_not_fts_syntax(self):
+        job = make_job(self.user, job_title="C++ Developer")
+        self.assertEqual(self.search('c++ "developer'), [job])
+        self.assertEqual(self.search("AND OR NOT"), [])
+
+    def test_queries_without_words_still_rank(self):
+        jobs = [make_job(self.user), make_job(self.user)]
+        for text in ("", "  ", "+++", '"*'):
+            self.assertEqual(self.search(text), jobs[::-1])
+
+    def test_dashboard_handles_punctuation_only_queries(self):
+        make_job(self.user)
+        self.client.force_login(User.objects.create_user("seeker"))
+        for query in ("++", "?!", "*"):
+            response = self.client.get(reverse("jobseeker_dashboard"), {"q": query})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context["job_posts"]), 1)
@@ -1,3 +1,60 @@
-from django.test import TestCase
+import random
+import string
+
+from django.test import SimpleTestCase
+from rapidfuzz import fuzz, process
+
+from .ats_score import match_skills
 
 # Create your tests here.
+
+
+def match_skills_one_by_one(candidates, jd_keywords):
+    """The per-candidate extractOne loop match_skills replaced."""
+    matched = set()
+    for c in candidates:
+        result = process.extractOne(c, jd_keywords, scorer=fuzz.token_sort_ratio)
+        if result:
+            match, score, _ = result
+            if score > 85:
+                matched.add(match)
+    return matched
+
+
+class MatchSkillsTests(SimpleTestCase):
+    KEYWORDS = {
+        "python", "django", "sql", "postgresql", "javascript", "react", "docker",
+        "kubernetes", "aws", "developer", "engineering", "api", "rest", "linux",
+        "machine", "learning", "analytics", "communication", "bachelor", "git",
+    }
+
+    def test_matches_extract_one_loop(self):
+        rng = random.Random(1234)
+        words = sorted(self.KEYWORDS) + ["team", "management", "university", "year", "data science"]
+        for _ in range(50):
+            candidates = set()
+            for _ in range(rng.randint(0, 200)):
+                word = rng.choice(words)
+                roll = rng.random()
+                if roll < 0.3:
+                    # typo: drop, swap or add one character
+                    i = rng.randrange(len(word))
+                    word = rng.choice([
+                        word[:i] + word[i + 1:],
+                        word[:i] + rng.choice(string.ascii_lowercase) + word[i:],
+                        word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:],
+                    ])
+                elif roll < 0.5:
+                    word = f"{word} {rng.choice(words)}"
+                elif roll < 0.6:
+                    word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 12)))
+                candidates.add(word)
+            self.assertEqual(
+                match_skills(candidates, self.KEYWORDS),
+                match_skills_one_by_one(candidates, self.KEYWORDS),
+            )
+
+    def test_exact_matches_and_empty_inputs(self):
+        self.assertEqual(match_skills({"python", "pythn", "cooking"}, self.KEYWORDS), {"python"})
+        self.assertEqual(match_skills(set(), self.KEYWORDS), set())
+        self.assertEqual(match_skills({"python"}, set()), set())
@@ -0,0 +1,239 @@
+# app/text_extraction.py
+
+import io
+import os
+import signal
+import logging
+import threading
+import multiprocessing
+from contextlib import contextmanager
+
+import docx
+
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- Limits ----------
+class ExtractionLimits:
+    """Caps on how much of a resume is read.
+
+    `timeout` bounds the whole PDF extraction, including a single
+    pathological page (see extract_pdf).
+    """
+
+    def __init__(self, max_pages: int = 30, max_chars: int = 200_000, timeout: float = 30.0):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.timeout = timeout
+
+    @classmethod
+    def from_settings(cls) -> "ExtractionLimits":
+        from django.conf import settings
+
+        limits = cls()
+        if settings.configured:
+            limits.max_pages = getattr(settings, "ATS_EXTRACT_MAX_PAGES", limits.max_pages)
+            limits.max_chars = getattr(settings, "ATS_EXTRACT_MAX_CHARS", limits.max_chars)
+            limits.timeout = getattr(settings, "ATS_EXTRACT_TIMEOUT", limits.timeout)
+        return limits
+
+
+# ---------- PDF Backends ----------
+class PdfPlumberBackend:
+    """pdfplumber with full layout analysis (the original extractor)."""
+
+    name = "pdfplumber"
+
+    def pages(self, path: str, max_pages: int):
+        import pdfplumber
+
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages[:max_pages]:
+                yield page.extract_text() or ""
+                # Drop the parsed layout objects before the next page
+                page.close()
+
+
+class PdfMinerBackend:
+    """pdfminer.six text conversion, without pdfplumber's object model."""
+
+    name = "pdfminer"
+
+    def pages(self, path: str, max_pages: int):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        rsrcmgr = PDFResourceManager()
+        with open(path, "rb") as f:
+            for page in PDFPage.get_pages(f, maxpages=max_pages):
+                out = io.StringIO()
+                device = TextConverter(rsrcmgr, out, laparams=LAParams())
+                PDFPageInterpreter(rsrcmgr, device).process_page(page)
+                device.close()
+                yield out.getvalue().replace("\x0c", "").strip()
+
+
+class PdfiumBackend:
+    """pypdfium2 text-only extraction; the fastest option, no layout analysis."""
+
+    name = "pdfium"
+
+    def pages(self, path: str, max_pages: int):
+        import pypdfium2
+
+        pdf = pypdfium2.PdfDocument(path)
+        try:
+            for i in range(min(len(pdf), max_pages)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                try:
+                    yield textpage.get_text_range().replace("\r\n", "\n").strip()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+
+
+PDF_BACKENDS = {
+    backend.name: backend
+    for backend in (PdfPlumberBackend, PdfMinerBackend, PdfiumBackend)
+}
+
+
+def get_pdf_backend(name: str = None):
+    """The backend called `name` (default: settings.ATS_PDF_BACKEND, else pdfplumber)."""
+    if name is None:
+        from django.conf import settings
+
+        name = getattr(settings, "ATS_PDF_BACKEND", "pdfplumber") if settings.configured else "pdfplumber"
+    try:
+        return PDF_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend: {name}") from None
+
+
+# ---------- Deadline ----------
+# Extra time a child process gets to return its partial text before it is killed
+CHILD_GRACE = 5.0
+
+
+class ExtractionTimeout(BaseException):
+    """Raised inside a backend when the deadline passes.
+
+    A BaseException, like KeyboardInterrupt, so parser code that catches
+    Exception cannot swallow it.
+    """
+
+
+def _can_alarm() -> bool:
+    return hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+
+
+@contextmanager
+def _deadline(seconds: float):
+    """Raise ExtractionTimeout in the main thread after `seconds`, via SIGALRM."""
+
+    def expire(signum, frame):
+        raise ExtractionTimeout()
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _extract_pdf_with_info(path, backend, limits):
+    info = {}
+    return extract_pdf(path, backend, limits, info), info
+
+
+def _extract_pdf_in_child(path, backend, limits, info) -> str:
+    """Run extract_pdf in a child process, where SIGALRM is usable, and kill it if it overruns."""
+    with multiprocessing.Pool(1) as pool:
+        result = pool.apply_async(_extract_pdf_with_info, (path, backend, limits))
+        try:
+            text, child_info = result.get(limits.timeout + CHILD_GRACE)
+        except multiprocessing.TimeoutError:
+            # Leaving the with block terminates the stuck child
+            logger.warning("PDF extraction of %s killed after %.0fs", path, limits.timeout + CHILD_GRACE)
+            info.update(backend=backend.name, pages=0, truncated="timeout")
+            return ""
+    info.update(child_info)
+    return text
+
+
+# ---------- Extraction ----------
+def extract_pdf(path: str, backend=None, limits: ExtractionLimits = None, info: dict = None) -> str:
+    """Stream pages from the backend, stopping at the page, character or time limit.
+
+    The time limit covers the whole extraction: in the main thread a SIGALRM
+    timer interrupts the backend mid-page; elsewhere (signals only reach the
+    main thread) the extraction runs in a child process that is killed if
+    it overruns. Whatever was read before a limit or a backend error is
+    returned, so a bad PDF yields partial text instead of stalling or
+    failing the worker.
+    """
+    backend = backend or get_pdf_backend()
+    limits = limits or ExtractionLimits.from_settings()
+    info = {} if info is None else info
+    if not _can_alarm():
+        return _extract_pdf_in_child(path, backend, limits, info)
+    info["backend"] = backend.name
+
+    parts = []
+    chars = 0
+    try:
+        with _deadline(limits.timeout):
+            for page_text in backend.pages(path, limits.max_pages):
+                parts.append(page_text)
+                chars += len(page_text) + 1
+                if chars >= limits.max_chars:
+                    info["truncated"] = "max_chars"
+                    break
+    except ExtractionTimeout:
+        info["truncated"] = "timeout"
+    except Exception as exc:
+        if not parts:
+            raise
+        logger.warning("PDF extraction of %s stopped after %d page(s): %s", path, len(parts), exc)
+        info["truncated"] = "error"
+
+    info["pages"] = len(parts)
+    if info.get("truncated"):
+        logger.warning("PDF extraction of %s truncated (%s)", path, info["truncated"])
+    return "\n".join(parts)[:limits.max_chars].strip()
+
+
+def extract_file(path: str, backend=None, limits: ExtractionLimits = None, info: dict = None) -> str:
+    """Extract raw text from PDF, DOCX, or TXT files within the configured limits."""
+    ext = os.path.splitext(path)[1].lower()
+    limits = limits or ExtractionLimits.from_settings()
+
+    if ext == ".pdf":
+        return extract_pdf(path, backend, limits, info)
+
+    elif ext in (".docx",):
+        doc = docx.Document(path)
+        parts = []
+        chars = 0
+        for p in doc.paragraphs:
+            if p.text.strip():
+                parts.append(p.text)
+                chars += len(p.text) + 1
+                if chars >= limits.max_chars:
+                    break
+        return "\n".join(parts)[:limits.max_chars]
+
+    elif ext == ".txt":
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            return f.read(limits.max_chars)
+
+    else:
+        raise ValueError(f"Unsupported format: {ext}")
@@ -12,6 +12,9 @@ urlpatterns = [
 company = [
     path("dashboard", companydashboard, name='dashboard'),
     path("jobdetails/<int:id>", jobdetails, name='jobdetails'),
+    path("job_applicants/<int:id>", job_applicants, name='job_applicants'),
+    path("ranked_applicants/<int:id>", ranked_applicants, name='ranked_applicants'),
+    path("bulk_upload/<int:id>", bulk_upload, name='bulk_upload'),
     path("deletejob/<int:id>", deletejob, name='deletejob'),
     path("editjob/<int:id>", editjob, name='editjob'),
     path("active_status/<int:id>", active_status, name='active_status'),
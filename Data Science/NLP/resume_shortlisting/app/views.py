@@ -1,13 +1,16 @@
 from django.shortcuts import render,redirect
 from django.contrib.auth import login,logout,authenticate
 from django.contrib.auth.models import User
+import zipfile
 from datetime import date, timedelta
 from django.core.paginator import Paginator
-from django.db.models import Q
-
-from .ats_score import ats_score
-
-from .models import JobPost,JobApplication,JobSeekerProfile,CompanyProfile
+from django.db.models import Count, Exists, F, OuterRef, Q
+from .ingest import iter_entries, store_entries
+from .pagination import KeysetPaginator
+from .recommendations import recommend_jobs
+from .search import search_jobs
+from .skills import canonical_skill
+from .models import JobPost,JobApplication,JobSeekerProfile,CompanyProfile,ApplicationSkill
 # Create your views here.
 def home(request):
     return render(request, 'home.html')
@@ -56,24 +59,8 @@ def companydashboard(request):
     today = date.today()
     next_week = today + timedelta(days=7)
 
-    # All jobs for this company (regardless of active/expired)
-    jobs = JobPost.objects.filter(user=request.user).order_by('-posted_at')
-
-    # Active = deadline today or later, and is_active=True
-    active_jobs = jobs.filter(is_active=True, last_date__gte=today)
-
-    # Expired = deadline passed (yesterday or earlier)
-    expired_jobs = jobs.filter(last_date__lt=today)
-
-    # Expiring soon = within next 7 days
-    expiring_soon = jobs.filter(
-        is_active=True,
-        last_date__gte=today,
-        last_date__lte=next_week
-    )
-
     if request.method == "POST":
-        JobPost.objects.create(
+        job = JobPost(
             user=request.user,
             job_title=request.POST.get("job_title"),
             company=request.POST.get("company"),
@@ -85,17 +72,30 @@ def companydashboard(request):
             salary=request.POST.get("salary"),
             is_active=True,
         )
+        job.refresh_jd_features()
+        job.save()
         return redirect("dashboard")
 
-    print("Active:", len(active_jobs))
-    print("Expired:", len(expired_jobs))
-    print("Expiring soon:", len(expiring_soon))
+    # All four counts in one conditional aggregate
+    # Active = deadline today or later, and is_active=True
+    # Expired = deadline passed (yesterday or earlier)
+    # Expiring soon = active, within next 7 days
+    counts = JobPost.objects.filter(user=request.user).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True, last_date__gte=today)),
+        expired=Count('id', filter=Q(last_date__lt=today)),
+        expiring_soon=Count('id', filter=Q(is_active=True, last_date__gte=today, last_date__lte=next_week)),
+    )
+
+    # One page of jobs, with applicant counts from the same query
+    jobs = JobPost.objects.filter(user=request.user).annotate(applicant_count=Count('jobapplication'))
+    paginator = KeysetPaginator(jobs, 20, ('-posted_at', '-id'))
+    job_page = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
 
     return render(request, "company_dashboard.html", {
-        "jobs": jobs,
-        "active_jobs": active_jobs,
-        "expired_jobs": expired_jobs,
-        "expiring_soon": expiring_soon,
+        "jobs": job_page,
+        "counts": counts,
+        "today": today,
     })
 
 
@@ -105,6 +105,90 @@ def jobdetails(request, id):
     applied_job = JobApplication.objects.filter(job=job, job_seeker=request.user)
     return render(request, 'job_details.html', {'job': job, "today":date.today(), "applied_job":applied_job})
 
+# Sort options of job_applicants; id last keeps pages stable on ties
+APPLICANT_SORTS = {
+    'score': ('-ats_score', '-id'),
+    'experience': (F('experience_years').desc(nulls_last=True), '-ats_score', '-id'),
+    'recent': ('-applied_at', '-id'),
+}
+
+def job_applicants(request, id):
+    from .ats_score import EDUCATION_TIERS
+
+    job = JobPost.objects.get(id=id, user=request.user)
+    # Mapped through the taxonomy like extracted skills, so "k8s" finds "kubernetes"
+    skills = list(dict.fromkeys(canonical_skill(s) for s in request.GET.get('skills', '').split(',') if s.strip()))
+    min_years = request.GET.get('min_years', '')
+    education = request.GET.get('education', '')
+    sort = request.GET.get('sort', 'score')
+    hide_duplicates = request.GET.get('hide_duplicates') == '1'
+
+    # Stored features only (see scoring.py), so this is one indexed query
+    applicants = JobApplication.objects.filter(job=job).select_related('job_seeker', 'duplicate_of__job_seeker')
+    if hide_duplicates:
+        applicants = applicants.filter(duplicate_of__isnull=True)
+    for skill in skills:
+        applicants = applicants.filter(
+            Exists(ApplicationSkill.objects.filter(application=OuterRef('pk'), skill=skill))
+        )
+    if min_years.isdigit():
+        applicants = applicants.filter(experience_years__gte=int(min_years))
+    if education in EDUCATION_TIERS:
+        applicants = applicants.filter(education_tier__in=EDUCATION_TIERS[education])
+    applicants = applicants.order_by(*APPLICANT_SORTS.get(sort, APPLICANT_SORTS['score'])).prefetch_related('skills')
+
+    paginator = Paginator(applicants, 20)
+    page = paginator.get_page(request.GET.get('page'))
+
+    filter_params = request.GET.copy()
+    filter_params.pop('page', None)
+
+    return render(request, 'job_applicants.html', {
+        'job': job,
+        'page': page,
+        'skills': ', '.join(skills),
+        'min_years': min_years,
+        'education': education,
+        'sort': sort,
+        'hide_duplicates': hide_duplicates,
+        'duplicate_count': JobApplication.objects.filter(job=job, duplicate_of__isnull=False).count(),
+        'known_skills': ApplicationSkill.objects.filter(application__job=job).values_list('skill', flat=True).distinct().order_by('skill'),
+        'filter_query': filter_params.urlencode(),
+    })
+
+def ranked_applicants(request, id):
+    from .ranking import rank_applicants
+
+    job = JobPost.objects.get(id=id, user=request.user)
+    top = request.GET.get('top', '20')
+    top = int(top) if top.isdigit() and int(top) > 0 else 20
+    info = {}
+    ranked = rank_applicants(job, top, info=info)
+    return render(request, 'ranked_applicants.html', {
+        'job': job,
+        'ranked': ranked,
+        'top': top,
+        'omitted': info['omitted'],
+    })
+
+def bulk_upload(request, id):
+    job = JobPost.objects.get(id=id, user=request.user)
+    if request.method != "POST" or not request.FILES.get("archive"):
+        return redirect(job_applicants, id)
+
+    # Applications are created pending; the score_worker scores them in its pool
+    report = []
+    try:
+        for created, rows in store_entries(job, iter_entries(request.FILES["archive"])):
+            report.extend(rows)
+    except zipfile.BadZipFile:
+        report.append({"file": request.FILES["archive"].name, "error": "Not a valid ZIP archive"})
+    return render(request, 'bulk_upload_report.html', {
+        'job': job,
+        'report': report,
+        'imported': sum(1 for row in report if 'application' in row),
+    })
+
 def deletejob(request, id):
     job = JobPost.objects.get(id=id)
     job.delete()
@@ -119,10 +203,19 @@ def editjob(request, id):
         job.location = request.POST.get("location")
         job.job_type = request.POST.get("job_type")
         job.experience = request.POST.get("experience")
-        job.description = request.POST.get("description")
+        description = request.POST.get("description")
+        description_changed = description != job.description
+        if description_changed or job.jd_keywords is None:
+            job.description = description
+            job.refresh_jd_features()
         job.last_date = request.POST.get("last_date")
         job.salary = request.POST.get("salary")
         job.save()
+        if description_changed:
+            from .scoring import request_jd_rescore
+
+            # Scores were computed against the old text; score_worker recomputes them from cached features
+            request_jd_rescore(job)
         return redirect(jobdetails, id)
     return redirect(jobdetails, id)
 
@@ -164,54 +257,53 @@ def jobseeker_dashboard(request):
     job_type = request.GET.get('job_type', '')
     experience = request.GET.get('experience', '')
     
-    # Start with all active jobs
-    jobs = JobPost.objects.filter(is_active=True).exclude(
-        jobapplication__job_seeker=request.user
+    # Start with all active jobs the user hasn't applied to (NOT EXISTS anti-join)
+    jobs = JobPost.objects.filter(is_active=True).filter(
+        ~Exists(JobApplication.objects.filter(job=OuterRef('pk'), job_seeker=request.user))
     )
 
     
     # Apply filters if provided
-    if query:
-        jobs = jobs.filter(
-            Q(job_title__icontains=query) | 
-            Q(company__icontains=query) | 
-            Q(description__icontains=query)
-        )
-    
     if job_type:
         jobs = jobs.filter(job_type=job_type)
         
     if experience:
         jobs = jobs.filter(experience=experience)
     
-    jobs = jobs.order_by('-posted_at')
+    # Full-text search ranks by relevance; otherwise newest first
+    if query:
+        jobs = search_jobs(jobs, query)
+        ordering = ('search_rank', '-posted_at', '-id')
+    else:
+        ordering = ('-posted_at', '-id')
     
-    paginator = Paginator(jobs, 6)  # Show 6 jobs per page
-    page_number = request.GET.get('page')
-    job_posts = paginator.get_page(page_number)
-
+    paginator = KeysetPaginator(jobs, 6, ordering)  # Show 6 jobs per page
+    job_posts = paginator.get_page(after=request.GET.get('after'), before=request.GET.get('before'))
 
+    # Filters carried over to the Previous/Next links
+    filter_params = request.GET.copy()
+    for key in ('after', 'before', 'page'):
+        filter_params.pop(key, None)
     
+    # Recommendations only on the unfiltered first page
+    first_page = not any(request.GET.get(key) for key in ('q', 'job_type', 'experience', 'after', 'before'))
+
     context = {
         'job_posts': job_posts,
+        'filter_query': filter_params.urlencode(),
+        'recommended': recommend_jobs(request.user) if first_page else [],
     }
     return render(request, 'jobseeker_dashboard.html', context)
 
 def apply_job(request):
     if request.method == "POST":
-        resume = request.FILES.get("resume")
-
-        joba = JobApplication.objects.create(
+        # Scored later by the score_worker management command
+        JobApplication.objects.create(
             job=JobPost.objects.get(id=request.POST.get("job_id")),
             job_seeker=request.user,
             resume=request.FILES.get("resume"),
+            scoring_status=JobApplication.SCORING_PENDING,
         )
-        
-        ats = ats_score(joba.resume.path,JobPost.objects.get(id= request.POST.get('job_id')).description)
-        print(ats)
-        job = JobApplication.objects.get(id=joba.id)
-        job.ats_score = ats
-        job.save()
     return redirect("jobseeker_dashboard")
 
 
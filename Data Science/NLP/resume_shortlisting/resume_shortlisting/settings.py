@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -126,3 +127,62 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+
+# Extracted resume features, keyed by SHA-256 of the uploaded file
+ATS_CACHE_DIR = BASE_DIR / 'ats_cache'
+ATS_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# Resume text extraction: PDF backend (pdfplumber, pdfminer or pdfium) and limits;
+# the timeout (seconds) bounds the whole extraction of one PDF
+ATS_PDF_BACKEND = 'pdfplumber'
+ATS_EXTRACT_MAX_PAGES = 30
+ATS_EXTRACT_MAX_CHARS = 200_000
+ATS_EXTRACT_TIMEOUT = 30.0
+
+# Shared NLP service (`manage.py run_nlp_service`), e.g. 'unix:/tmp/ats_nlp.sock'
+# or '127.0.0.1:8765'. None parses in each process.
+ATS_NLP_SERVICE = os.environ.get('ATS_NLP_SERVICE') or None
+ATS_NLP_SERVICE_TIMEOUT = 120.0
+# If the service fails or times out, parse in-process (loading spaCy in this
+# worker, with a warning logged). Set False to raise NLPServiceError instead,
+# which marks the application failed but keeps workers from each loading the model.
+ATS_NLP_SERVICE_FALLBACK = True
+
+# Skill extraction for ats_score: 'nlp' (noun candidates fuzzy-matched to JD
+# keywords) or 'taxonomy' (app/skills.py phrase matcher). ATS_SKILLS_FILE may
+# point to a JSON {skill: [aliases]} file extending the built-in taxonomy.
+ATS_SKILL_EXTRACTOR = 'nlp'
+ATS_SKILLS_FILE = None
+
+# Seconds before an application left 'running' by a dead score worker is claimed again
+ATS_CLAIM_TIMEOUT = 30 * 60
+
+# Largest single resume accepted from a bulk ZIP/directory import (see app/ingest.py)
+ATS_INGEST_MAX_FILE_BYTES = 10 * 1024 * 1024
+
+# Per-stage ATS timing (see app/ats_timing.py); summarise with `manage.py ats_timing_report`
+ATS_TIMING = os.environ.get('ATS_TIMING') == '1'
+ATS_TIMING_LOG = BASE_DIR / 'ats_timing.log'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json_line': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'ats_timing_file': {
+            'class': 'logging.FileHandler',
+            'filename': ATS_TIMING_LOG,
+            'formatter': 'json_line',
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'app.ats_timing': {
+            'handlers': ['ats_timing_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}